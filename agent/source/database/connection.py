@@ -1,19 +1,107 @@
 import sqlite3
+import threading
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Generator
+from typing import Optional, Generator, Iterator
 import logging
 
 from tools.config import DATABASE_PATH
 
 logger = logging.getLogger(__name__)
 
+# 接続ごとに適用するPRAGMA（WAL前提でfsyncを抑え、一時領域とキャッシュをメモリに置く）
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA cache_size = -65536",
+)
+
+# 接続ごとのプリペアドステートメントキャッシュ数（デフォルトは128）
+STATEMENT_CACHE_SIZE = 256
+
+# スキーマのバージョン（PRAGMA user_versionに記録。スキーマを変更したら必ず上げる）
+SCHEMA_VERSION = 1
+
+# 初期化のたびに実行する統計情報の更新（解析する行数を制限してコストを抑える）
+# SQLite 3.46以降のPRAGMA optimizeは接続直後でも必要なテーブルだけを解析する（0x10000）。
+# それ以前は接続中のクエリ履歴がないと何も解析しないため、ANALYZEで代替する。
+if sqlite3.sqlite_version_info >= (3, 46, 0):
+    STATISTICS_PRAGMAS = ("PRAGMA analysis_limit = 1000", "PRAGMA optimize = 0x10002")
+else:
+    STATISTICS_PRAGMAS = ("PRAGMA analysis_limit = 1000", "ANALYZE")
+
+# 全文検索（FTS5）インデックステーブル
+FTS_TABLES = ("papers_fts", "posters_fts")
+
+
+def _fts5_trigram_available() -> bool:
+    """FTS5とtrigramトークナイザー（SQLite 3.34以降）が使えるか確認"""
+    try:
+        conn = sqlite3.connect(":memory:")
+        try:
+            conn.execute("CREATE VIRTUAL TABLE probe USING fts5(x, tokenize='trigram')")
+        finally:
+            conn.close()
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+# 全文検索が使えない環境ではLIKE検索にフォールバックする
+FTS5_TRIGRAM_AVAILABLE = _fts5_trigram_available()
+
+# 全文検索テーブルと同期用トリガー（外部コンテンツ方式）
+FTS_SCHEMA_SQL = """
+    -- papers_fts テーブル（全文検索、trigramでCJKの部分一致に対応）
+    CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+        file_name, title, abstract, keywords,
+        content='papers', content_rowid='id', tokenize='trigram'
+    );
+    CREATE TRIGGER IF NOT EXISTS papers_fts_insert AFTER INSERT ON papers BEGIN
+        INSERT INTO papers_fts(rowid, file_name, title, abstract, keywords)
+        VALUES (new.id, new.file_name, new.title, new.abstract, new.keywords);
+    END;
+    CREATE TRIGGER IF NOT EXISTS papers_fts_delete AFTER DELETE ON papers BEGIN
+        INSERT INTO papers_fts(papers_fts, rowid, file_name, title, abstract, keywords)
+        VALUES ('delete', old.id, old.file_name, old.title, old.abstract, old.keywords);
+    END;
+    CREATE TRIGGER IF NOT EXISTS papers_fts_update AFTER UPDATE ON papers BEGIN
+        INSERT INTO papers_fts(papers_fts, rowid, file_name, title, abstract, keywords)
+        VALUES ('delete', old.id, old.file_name, old.title, old.abstract, old.keywords);
+        INSERT INTO papers_fts(rowid, file_name, title, abstract, keywords)
+        VALUES (new.id, new.file_name, new.title, new.abstract, new.keywords);
+    END;
+
+    -- posters_fts テーブル（全文検索、trigramでCJKの部分一致に対応）
+    CREATE VIRTUAL TABLE IF NOT EXISTS posters_fts USING fts5(
+        file_name, title, abstract, keywords,
+        content='posters', content_rowid='id', tokenize='trigram'
+    );
+    CREATE TRIGGER IF NOT EXISTS posters_fts_insert AFTER INSERT ON posters BEGIN
+        INSERT INTO posters_fts(rowid, file_name, title, abstract, keywords)
+        VALUES (new.id, new.file_name, new.title, new.abstract, new.keywords);
+    END;
+    CREATE TRIGGER IF NOT EXISTS posters_fts_delete AFTER DELETE ON posters BEGIN
+        INSERT INTO posters_fts(posters_fts, rowid, file_name, title, abstract, keywords)
+        VALUES ('delete', old.id, old.file_name, old.title, old.abstract, old.keywords);
+    END;
+    CREATE TRIGGER IF NOT EXISTS posters_fts_update AFTER UPDATE ON posters BEGIN
+        INSERT INTO posters_fts(posters_fts, rowid, file_name, title, abstract, keywords)
+        VALUES ('delete', old.id, old.file_name, old.title, old.abstract, old.keywords);
+        INSERT INTO posters_fts(rowid, file_name, title, abstract, keywords)
+        VALUES (new.id, new.file_name, new.title, new.abstract, new.keywords);
+    END;
+"""
+
 
 class DatabaseConnection:
     """データベース接続を管理するクラス"""
     
     def __init__(self, db_path: Optional[Path] = None):
         self.db_path = db_path or DATABASE_PATH
+        # スレッドごとに接続を1本保持して使い回す（sqlite3の接続はスレッド間で共有しない）
+        self._local = threading.local()
         self._ensure_database_exists()
     
     def _ensure_database_exists(self):
@@ -21,24 +109,47 @@ class DatabaseConnection:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         logger.info(f"データベースパス: {self.db_path}")
     
+    def _open_connection(self) -> sqlite3.Connection:
+        """新しい接続を開き、接続ごとの設定を適用"""
+        conn = sqlite3.connect(str(self.db_path), cached_statements=STATEMENT_CACHE_SIZE)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
     @contextmanager
     def get_connection(self) -> Generator[sqlite3.Connection, None, None]:
-        """データベース接続を取得するコンテキストマネージャー"""
-        conn = None
+        """データベース接続を取得するコンテキストマネージャー
+        
+        接続は現在のスレッドで使い回し、閉じずにコミット（エラー時はロールバック）する。
+        入れ子で呼ばれた場合は最も外側の呼び出しでのみコミットする。
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open_connection()
+            self._local.conn = conn
+            self._local.depth = 0
+        
+        self._local.depth += 1
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            conn.row_factory = sqlite3.Row
-            conn.execute("PRAGMA foreign_keys = ON")
             yield conn
-            conn.commit()
+            if self._local.depth == 1:
+                conn.commit()
         except Exception as e:
-            if conn:
+            if self._local.depth == 1:
                 conn.rollback()
-            logger.error(f"データベースエラー: {e}")
+                logger.error(f"データベースエラー: {e}")
             raise
         finally:
-            if conn:
-                conn.close()
+            self._local.depth -= 1
+    
+    def close(self):
+        """現在のスレッドが保持している接続を閉じる"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
     
     def initialize_database(self):
         """データベースを初期化（カテゴリー別テーブル作成）"""
@@ -106,12 +217,60 @@ class DatabaseConnection:
         CREATE INDEX IF NOT EXISTS idx_datasets_name ON datasets(name);
         CREATE INDEX IF NOT EXISTS idx_papers_file_name ON papers(file_name);
         CREATE INDEX IF NOT EXISTS idx_posters_file_name ON posters(file_name);
-        CREATE INDEX IF NOT EXISTS idx_dataset_files_dataset_id ON dataset_files(dataset_id);
+        CREATE INDEX IF NOT EXISTS idx_dataset_files_dataset_indexed
+            ON dataset_files(dataset_id, indexed_at);
+        DROP INDEX IF EXISTS idx_dataset_files_dataset_id;
+        
+        -- 一覧取得（ORDER BY）用インデックス
+        CREATE INDEX IF NOT EXISTS idx_datasets_created_at ON datasets(created_at);
+        CREATE INDEX IF NOT EXISTS idx_papers_indexed_at ON papers(indexed_at);
+        CREATE INDEX IF NOT EXISTS idx_posters_indexed_at ON posters(indexed_at);
         """
         
         with self.get_connection() as conn:
-            conn.executescript(create_tables_sql)
-            logger.info("データベースの初期化が完了しました")
+            existing_tables = {
+                row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )
+            }
+            # user_versionは全文検索テーブルの有無を記録しないため、テーブルの存在も確認する
+            # （trigramが使えない環境で初期化済みのデータベースでも後から作成できるように）
+            fts_ready = not FTS5_TRIGRAM_AVAILABLE or all(
+                fts_table in existing_tables for fts_table in FTS_TABLES
+            )
+            schema_version = conn.execute("PRAGMA user_version").fetchone()[0]
+            
+            # 適用済みのスキーマと同じバージョンであれば作成処理を省略
+            if schema_version == SCHEMA_VERSION and fts_ready:
+                logger.info("データベースは最新のスキーマで初期化済みです")
+            else:
+                self._create_schema(conn, create_tables_sql, existing_tables)
+                logger.info("データベースの初期化が完了しました")
+            
+            # 初回作成時の空のテーブルではなく、現在のデータ量に合わせた統計情報に更新
+            for pragma in STATISTICS_PRAGMAS:
+                conn.execute(pragma)
+    
+    def _create_schema(
+        self, conn: sqlite3.Connection, create_tables_sql: str, existing_tables: set
+    ):
+        """テーブル・インデックス・全文検索テーブルを作成し、スキーマのバージョンを記録"""
+        # WALはデータベースファイルに永続化されるため初期化時に一度だけ設定
+        if str(self.db_path) != ":memory:":
+            conn.execute("PRAGMA journal_mode = WAL")
+        
+        conn.executescript(create_tables_sql)
+        
+        if FTS5_TRIGRAM_AVAILABLE:
+            conn.executescript(FTS_SCHEMA_SQL)
+            # 既存データがある状態で全文検索テーブルを新規作成した場合は索引を再構築
+            for fts_table in FTS_TABLES:
+                if fts_table not in existing_tables:
+                    conn.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES('rebuild')")
+        else:
+            logger.warning("FTS5（trigram）が利用できないため、キーワード検索はLIKEで行います")
+        
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     
     def execute_query(self, query: str, params: Optional[tuple] = None):
         """単一のクエリを実行"""
@@ -142,13 +301,17 @@ class DatabaseConnection:
     
     def fetch_all(self, query: str, params: Optional[tuple] = None) -> list:
         """全行を取得"""
+        return list(self.iter_rows(query, params))
+    
+    def iter_rows(self, query: str, params: Optional[tuple] = None) -> Iterator[sqlite3.Row]:
+        """カーソルから1行ずつ取得するジェネレーター（結果全体を一度に展開しない）"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             if params:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
-            return cursor.fetchall()
+            yield from cursor
 
 
 # シングルトンインスタンス
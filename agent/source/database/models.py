@@ -1,8 +1,53 @@
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import asdict, dataclass, is_dataclass
+from datetime import date, datetime, time
+from enum import Enum
 from typing import Optional, Dict, Any
+from uuid import UUID
 import json
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _json_default(value: Any) -> Any:
+    """orjsonが標準で変換する型を標準jsonでも同じ表現に変換"""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dump_metadata(metadata: Optional[Dict[str, Any]]) -> Optional[str]:
+    """metadataをTEXT列に保存するJSON文字列に変換（orjsonがあれば使用）
+    
+    metadataのLIKE検索がorjsonの有無で変わらないよう、標準jsonでも
+    orjsonと同じ表現（非ASCII文字はそのまま、区切りの空白なし）で出力する。
+    """
+    if not metadata:
+        return None
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(metadata, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(
+        metadata, ensure_ascii=False, separators=(",", ":"), default=_json_default
+    )
+
+
+def load_metadata(value: Any) -> Any:
+    """TEXT列のJSON文字列をmetadataに復元（文字列以外はそのまま返す）"""
+    if not value or not isinstance(value, str):
+        return value
+    if ORJSON_AVAILABLE:
+        return orjson.loads(value)
+    return json.loads(value)
+
 
 @dataclass
 class File:
@@ -33,7 +78,7 @@ class File:
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
             "indexed_at": self.indexed_at.isoformat() if self.indexed_at else None,
             "summary": self.summary,
-            "metadata": json.dumps(self.metadata) if self.metadata else None,
+            "metadata": dump_metadata(self.metadata),
             "content_hash": self.content_hash
         }
 
@@ -46,8 +91,8 @@ class File:
             data["updated_at"] = datetime.fromisoformat(data["updated_at"])
         if data.get("indexed_at"):
             data["indexed_at"] = datetime.fromisoformat(data["indexed_at"])
-        if data.get("metadata") and isinstance(data["metadata"], str):
-            data["metadata"] = json.loads(data["metadata"])
+        if data.get("metadata"):
+            data["metadata"] = load_metadata(data["metadata"])
         return cls(**data)
 
 
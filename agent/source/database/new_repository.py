@@ -2,11 +2,19 @@ from typing import List, Optional
 from datetime import datetime
 import logging
 
-from .connection import db_connection
+from .connection import db_connection, FTS5_TRIGRAM_AVAILABLE
 from .new_models import Dataset, Paper, Poster, DatasetFile
 
 logger = logging.getLogger(__name__)
 
+# trigramトークナイザーは3文字未満のキーワードに一致しない
+FTS_MIN_KEYWORD_LENGTH = 3
+
+
+def _fts_phrase(keyword: str) -> str:
+    """キーワードをFTS5のフレーズ検索式に変換（部分一致）"""
+    return '"' + keyword.replace('"', '""') + '"'
+
 
 class DatasetRepository:
     """データセットテーブルのリポジトリ"""
@@ -43,9 +51,14 @@ class DatasetRepository:
     def find_all(self) -> List[Dataset]:
         """全データセットを取得"""
         query = "SELECT * FROM datasets ORDER BY created_at DESC"
-        rows = self.db.fetch_all(query)
+        rows = self.db.iter_rows(query)
         return [Dataset.from_dict(dict(row)) for row in rows]
     
+    def count(self) -> int:
+        """データセットの件数を取得（行を読み込まずに集計）"""
+        row = self.db.fetch_one("SELECT COUNT(*) FROM datasets")
+        return row[0] if row else 0
+    
     def update(self, dataset: Dataset) -> bool:
         """データセットを更新"""
         query = """
@@ -76,8 +89,10 @@ class DatasetRepository:
 class PaperRepository:
     """論文テーブルのリポジトリ"""
     
-    def __init__(self):
+    def __init__(self, use_fts5: bool = FTS5_TRIGRAM_AVAILABLE):
         self.db = db_connection
+        # Falseの場合は常にLIKE検索を使う（全文検索インデックスとの結果比較用）
+        self.use_fts5 = use_fts5
     
     def create(self, paper: Paper) -> Paper:
         """論文を作成"""
@@ -111,9 +126,14 @@ class PaperRepository:
     def find_all(self) -> List[Paper]:
         """全論文を取得"""
         query = "SELECT * FROM papers ORDER BY indexed_at DESC"
-        rows = self.db.fetch_all(query)
+        rows = self.db.iter_rows(query)
         return [Paper.from_dict(dict(row)) for row in rows]
     
+    def count(self) -> int:
+        """論文の件数を取得（行を読み込まずに集計）"""
+        row = self.db.fetch_one("SELECT COUNT(*) FROM papers")
+        return row[0] if row else 0
+    
     def update(self, paper: Paper) -> bool:
         """論文を更新"""
         query = """
@@ -133,7 +153,20 @@ class PaperRepository:
         return success
     
     def search(self, keyword: str) -> List[Paper]:
-        """キーワードで論文を検索"""
+        """キーワードで論文を検索（全文検索インデックス使用）"""
+        if not self.use_fts5 or len(keyword) < FTS_MIN_KEYWORD_LENGTH:
+            return self._search_like(keyword)
+        
+        query = """
+        SELECT * FROM papers
+        WHERE id IN (SELECT rowid FROM papers_fts WHERE papers_fts MATCH ?)
+        ORDER BY indexed_at DESC
+        """
+        rows = self.db.iter_rows(query, (_fts_phrase(keyword),))
+        return [Paper.from_dict(dict(row)) for row in rows]
+    
+    def _search_like(self, keyword: str) -> List[Paper]:
+        """キーワードで論文を検索（LIKEによる全件走査）"""
         query = """
         SELECT * FROM papers 
         WHERE file_name LIKE ? OR title LIKE ? OR abstract LIKE ? OR keywords LIKE ?
@@ -142,15 +175,17 @@ class PaperRepository:
         keyword_pattern = f"%{keyword}%"
         params = (keyword_pattern, keyword_pattern, keyword_pattern, keyword_pattern)
         
-        rows = self.db.fetch_all(query, params)
+        rows = self.db.iter_rows(query, params)
         return [Paper.from_dict(dict(row)) for row in rows]
 
 
 class PosterRepository:
     """ポスターテーブルのリポジトリ"""
     
-    def __init__(self):
+    def __init__(self, use_fts5: bool = FTS5_TRIGRAM_AVAILABLE):
         self.db = db_connection
+        # Falseの場合は常にLIKE検索を使う（全文検索インデックスとの結果比較用）
+        self.use_fts5 = use_fts5
     
     def create(self, poster: Poster) -> Poster:
         """ポスターを作成"""
@@ -184,9 +219,14 @@ class PosterRepository:
     def find_all(self) -> List[Poster]:
         """全ポスターを取得"""
         query = "SELECT * FROM posters ORDER BY indexed_at DESC"
-        rows = self.db.fetch_all(query)
+        rows = self.db.iter_rows(query)
         return [Poster.from_dict(dict(row)) for row in rows]
     
+    def count(self) -> int:
+        """ポスターの件数を取得（行を読み込まずに集計）"""
+        row = self.db.fetch_one("SELECT COUNT(*) FROM posters")
+        return row[0] if row else 0
+    
     def update(self, poster: Poster) -> bool:
         """ポスターを更新"""
         query = """
@@ -206,7 +246,20 @@ class PosterRepository:
         return success
     
     def search(self, keyword: str) -> List[Poster]:
-        """キーワードでポスターを検索"""
+        """キーワードでポスターを検索（全文検索インデックス使用）"""
+        if not self.use_fts5 or len(keyword) < FTS_MIN_KEYWORD_LENGTH:
+            return self._search_like(keyword)
+        
+        query = """
+        SELECT * FROM posters
+        WHERE id IN (SELECT rowid FROM posters_fts WHERE posters_fts MATCH ?)
+        ORDER BY indexed_at DESC
+        """
+        rows = self.db.iter_rows(query, (_fts_phrase(keyword),))
+        return [Poster.from_dict(dict(row)) for row in rows]
+    
+    def _search_like(self, keyword: str) -> List[Poster]:
+        """キーワードでポスターを検索（LIKEによる全件走査）"""
         query = """
         SELECT * FROM posters 
         WHERE file_name LIKE ? OR title LIKE ? OR abstract LIKE ? OR keywords LIKE ?
@@ -215,7 +268,7 @@ class PosterRepository:
         keyword_pattern = f"%{keyword}%"
         params = (keyword_pattern, keyword_pattern, keyword_pattern, keyword_pattern)
         
-        rows = self.db.fetch_all(query, params)
+        rows = self.db.iter_rows(query, params)
         return [Poster.from_dict(dict(row)) for row in rows]
 
 
@@ -242,10 +295,31 @@ class DatasetFileRepository:
         logger.info(f"データセットファイルを登録: {dataset_file.file_name}")
         return dataset_file
     
+    def create_many(self, dataset_files: List[DatasetFile]) -> int:
+        """データセットファイルを単一トランザクションで一括登録"""
+        if not dataset_files:
+            return 0
+        
+        query = """
+        INSERT INTO dataset_files (
+            dataset_id, file_path, file_name, file_type, file_size,
+            created_at, updated_at, content_hash
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        params_list = [
+            (f.dataset_id, f.file_path, f.file_name, f.file_type, f.file_size,
+             f.created_at, f.updated_at, f.content_hash)
+            for f in dataset_files
+        ]
+        
+        self.db.execute_many(query, params_list)
+        logger.info(f"データセットファイルを一括登録: {len(dataset_files)}件")
+        return len(dataset_files)
+    
     def find_by_dataset_id(self, dataset_id: int) -> List[DatasetFile]:
         """データセットIDでファイルを検索"""
         query = "SELECT * FROM dataset_files WHERE dataset_id = ? ORDER BY indexed_at DESC"
-        rows = self.db.fetch_all(query, (dataset_id,))
+        rows = self.db.iter_rows(query, (dataset_id,))
         return [DatasetFile.from_dict(dict(row)) for row in rows]
     
     def find_by_path(self, file_path: str) -> Optional[DatasetFile]:
@@ -3,10 +3,66 @@ from datetime import datetime
 import logging
 
 from .connection import db_connection
-from .models import File, ResearchTopic, AnalysisResult
+from .models import File, ResearchTopic, AnalysisResult, dump_metadata
 
 logger = logging.getLogger(__name__)
 
+# SQL文はモジュール定数として共有し、接続ごとのステートメントキャッシュを再利用させる
+_SQL_INSERT_FILE = """
+INSERT INTO files (
+    file_path, file_name, file_type, category, file_size,
+    created_at, updated_at, indexed_at, summary, metadata, content_hash
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+# 単一行取得はFileの列を明示し、LIMIT 1で打ち切る
+# _LITE版はsummary/metadataを読まない（存在確認やID参照など読み込み頻度の高い箇所向け）
+_FILE_COLUMNS = """
+    id, file_path, file_name, file_type, category, file_size,
+    created_at, updated_at, indexed_at, summary, metadata, content_hash
+"""
+_FILE_COLUMNS_LITE = """
+    id, file_path, file_name, file_type, category, file_size,
+    created_at, updated_at, indexed_at, content_hash
+"""
+_SQL_FIND_FILE_BY_ID = f"SELECT {_FILE_COLUMNS} FROM files WHERE id = ? LIMIT 1"
+_SQL_FIND_FILE_BY_ID_LITE = f"SELECT {_FILE_COLUMNS_LITE} FROM files WHERE id = ? LIMIT 1"
+_SQL_FIND_FILE_BY_PATH = f"SELECT {_FILE_COLUMNS} FROM files WHERE file_path = ? LIMIT 1"
+_SQL_FIND_FILE_BY_PATH_LITE = (
+    f"SELECT {_FILE_COLUMNS_LITE} FROM files WHERE file_path = ? LIMIT 1"
+)
+_COLUMNAR_FILE_COLUMNS = ("id", "file_path", "file_type", "category", "file_size")
+_SQL_SELECT_FILE_COLUMNS = (
+    f"SELECT {', '.join(_COLUMNAR_FILE_COLUMNS)} FROM files WHERE 1=1"
+)
+_SQL_UPDATE_FILE = """
+UPDATE files SET
+    file_name = ?, file_type = ?, category = ?, file_size = ?,
+    created_at = ?, updated_at = ?, summary = ?, metadata = ?, content_hash = ?
+WHERE id = ?
+"""
+_SQL_DELETE_FILE = "DELETE FROM files WHERE id = ?"
+_SQL_SEARCH_FILES = """
+SELECT * FROM files 
+WHERE file_name LIKE ? OR summary LIKE ? OR metadata LIKE ?
+ORDER BY indexed_at DESC
+"""
+_SQL_INSERT_TOPIC = """
+INSERT INTO research_topics (file_id, topic, relevance_score, keywords)
+VALUES (?, ?, ?, ?)
+"""
+_SQL_FIND_TOPICS_BY_FILE_ID = "SELECT * FROM research_topics WHERE file_id = ? ORDER BY relevance_score DESC"
+_SQL_DELETE_TOPICS_BY_FILE_ID = "DELETE FROM research_topics WHERE file_id = ?"
+_SQL_INSERT_ANALYSIS_RESULT = """
+INSERT INTO analysis_results (file_id, analysis_type, result_data, created_at)
+VALUES (?, ?, ?, ?)
+"""
+_SQL_FIND_LATEST_ANALYSIS_RESULT = """
+SELECT * FROM analysis_results 
+WHERE file_id = ? AND analysis_type = ?
+ORDER BY created_at DESC
+LIMIT 1
+"""
+
 
 class FileRepository:
     """ファイルテーブルのリポジトリ"""
@@ -16,16 +72,11 @@ class FileRepository:
     
     def create(self, file: File) -> File:
         """ファイルを作成"""
-        query = """
-        INSERT INTO files (
-            file_path, file_name, file_type, category, file_size,
-            created_at, updated_at, indexed_at, summary, metadata, content_hash
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
+        query = _SQL_INSERT_FILE
         params = (
             file.file_path, file.file_name, file.file_type, file.category,
             file.file_size, file.created_at, file.updated_at, file.indexed_at,
-            file.summary, file.metadata, file.content_hash
+            file.summary, dump_metadata(file.metadata), file.content_hash
         )
         
         cursor = self.db.execute_query(query, params)
@@ -33,15 +84,34 @@ class FileRepository:
         logger.info(f"ファイルを登録しました: {file.file_name}")
         return file
     
-    def find_by_id(self, file_id: int) -> Optional[File]:
-        """IDでファイルを検索"""
-        query = "SELECT * FROM files WHERE id = ?"
+    def create_many(self, files: List[File]) -> int:
+        """複数ファイルを単一トランザクションで一括登録"""
+        if not files:
+            return 0
+        
+        query = _SQL_INSERT_FILE
+        params_list = [
+            (
+                file.file_path, file.file_name, file.file_type, file.category,
+                file.file_size, file.created_at, file.updated_at, file.indexed_at,
+                file.summary, dump_metadata(file.metadata), file.content_hash
+            )
+            for file in files
+        ]
+        
+        self.db.execute_many(query, params_list)
+        logger.info(f"ファイルを一括登録しました: {len(files)}件")
+        return len(files)
+    
+    def find_by_id(self, file_id: int, *, lite: bool = False) -> Optional[File]:
+        """IDでファイルを検索（lite=Trueの場合はsummary/metadataを取得しない）"""
+        query = _SQL_FIND_FILE_BY_ID_LITE if lite else _SQL_FIND_FILE_BY_ID
         row = self.db.fetch_one(query, (file_id,))
         return File.from_dict(dict(row)) if row else None
     
-    def find_by_path(self, file_path: str) -> Optional[File]:
-        """パスでファイルを検索"""
-        query = "SELECT * FROM files WHERE file_path = ?"
+    def find_by_path(self, file_path: str, *, lite: bool = False) -> Optional[File]:
+        """パスでファイルを検索（lite=Trueの場合はsummary/metadataを取得しない）"""
+        query = _SQL_FIND_FILE_BY_PATH_LITE if lite else _SQL_FIND_FILE_BY_PATH
         row = self.db.fetch_one(query, (file_path,))
         return File.from_dict(dict(row)) if row else None
     
@@ -61,20 +131,34 @@ class FileRepository:
         
         query += " ORDER BY indexed_at DESC"
         
-        rows = self.db.fetch_all(query, tuple(params) if params else None)
+        rows = self.db.iter_rows(query, tuple(params) if params else None)
         return [File.from_dict(dict(row)) for row in rows]
     
+    def find_all_columnar(self, category: Optional[str] = None,
+                          file_type: Optional[str] = None) -> Dict[str, List[Any]]:
+        """集計向けに主要列を列ごとのリストで取得（Fileオブジェクトを生成しない）"""
+        query = _SQL_SELECT_FILE_COLUMNS
+        params = []
+        
+        if category:
+            query += " AND category = ?"
+            params.append(category)
+        
+        if file_type:
+            query += " AND file_type = ?"
+            params.append(file_type)
+        
+        rows = self.db.fetch_all(query, tuple(params) if params else None)
+        if not rows:
+            return {column: [] for column in _COLUMNAR_FILE_COLUMNS}
+        return dict(zip(_COLUMNAR_FILE_COLUMNS, map(list, zip(*rows))))
+    
     def update(self, file: File) -> bool:
         """ファイルを更新"""
-        query = """
-        UPDATE files SET
-            file_name = ?, file_type = ?, category = ?, file_size = ?,
-            created_at = ?, updated_at = ?, summary = ?, metadata = ?, content_hash = ?
-        WHERE id = ?
-        """
+        query = _SQL_UPDATE_FILE
         params = (
             file.file_name, file.file_type, file.category, file.file_size,
-            file.created_at, file.updated_at, file.summary, file.metadata,
+            file.created_at, file.updated_at, file.summary, dump_metadata(file.metadata),
             file.content_hash, file.id
         )
         
@@ -86,7 +170,7 @@ class FileRepository:
     
     def delete(self, file_id: int) -> bool:
         """ファイルを削除"""
-        query = "DELETE FROM files WHERE id = ?"
+        query = _SQL_DELETE_FILE
         cursor = self.db.execute_query(query, (file_id,))
         success = cursor.rowcount > 0
         if success:
@@ -95,15 +179,11 @@ class FileRepository:
     
     def search(self, keyword: str) -> List[File]:
         """キーワードでファイルを検索"""
-        query = """
-        SELECT * FROM files 
-        WHERE file_name LIKE ? OR summary LIKE ? OR metadata LIKE ?
-        ORDER BY indexed_at DESC
-        """
+        query = _SQL_SEARCH_FILES
         keyword_pattern = f"%{keyword}%"
         params = (keyword_pattern, keyword_pattern, keyword_pattern)
         
-        rows = self.db.fetch_all(query, params)
+        rows = self.db.iter_rows(query, params)
         return [File.from_dict(dict(row)) for row in rows]
 
 
@@ -115,10 +195,7 @@ class ResearchTopicRepository:
     
     def create(self, topic: ResearchTopic) -> ResearchTopic:
         """研究トピックを作成"""
-        query = """
-        INSERT INTO research_topics (file_id, topic, relevance_score, keywords)
-        VALUES (?, ?, ?, ?)
-        """
+        query = _SQL_INSERT_TOPIC
         params = (topic.file_id, topic.topic, topic.relevance_score, topic.keywords)
         
         cursor = self.db.execute_query(query, params)
@@ -127,13 +204,13 @@ class ResearchTopicRepository:
     
     def find_by_file_id(self, file_id: int) -> List[ResearchTopic]:
         """ファイルIDで研究トピックを検索"""
-        query = "SELECT * FROM research_topics WHERE file_id = ? ORDER BY relevance_score DESC"
-        rows = self.db.fetch_all(query, (file_id,))
+        query = _SQL_FIND_TOPICS_BY_FILE_ID
+        rows = self.db.iter_rows(query, (file_id,))
         return [ResearchTopic.from_dict(dict(row)) for row in rows]
     
     def delete_by_file_id(self, file_id: int) -> bool:
         """ファイルIDで研究トピックを削除"""
-        query = "DELETE FROM research_topics WHERE file_id = ?"
+        query = _SQL_DELETE_TOPICS_BY_FILE_ID
         cursor = self.db.execute_query(query, (file_id,))
         return cursor.rowcount > 0
 
@@ -146,10 +223,7 @@ class AnalysisResultRepository:
     
     def create(self, result: AnalysisResult) -> AnalysisResult:
         """解析結果を作成"""
-        query = """
-        INSERT INTO analysis_results (file_id, analysis_type, result_data, created_at)
-        VALUES (?, ?, ?, ?)
-        """
+        query = _SQL_INSERT_ANALYSIS_RESULT
         params = (result.file_id, result.analysis_type, result.result_data, result.created_at)
         
         cursor = self.db.execute_query(query, params)
@@ -168,17 +242,12 @@ class AnalysisResultRepository:
         
         query += " ORDER BY created_at DESC"
         
-        rows = self.db.fetch_all(query, tuple(params))
+        rows = self.db.iter_rows(query, tuple(params))
         return [AnalysisResult.from_dict(dict(row)) for row in rows]
     
     def find_latest_by_file_id(self, file_id: int, 
                               analysis_type: str) -> Optional[AnalysisResult]:
         """最新の解析結果を取得"""
-        query = """
-        SELECT * FROM analysis_results 
-        WHERE file_id = ? AND analysis_type = ?
-        ORDER BY created_at DESC
-        LIMIT 1
-        """
+        query = _SQL_FIND_LATEST_ANALYSIS_RESULT
         row = self.db.fetch_one(query, (file_id, analysis_type))
         return AnalysisResult.from_dict(dict(row)) if row else None
\ No newline at end of file
@@ -1,6 +1,7 @@
 from typing import List, Dict, Any
 import logging
 from pathlib import Path
+from collections import Counter
 
 from .scanner import FileScanner
 from ..database.repository import FileRepository
@@ -53,6 +54,7 @@ class FileIndexer:
         
         # スキャンしたファイルを処理
         scanned_paths = set()
+        new_files: List[File] = []
         for file_obj in scanned_files:
             scanned_paths.add(file_obj.file_path)
             
@@ -69,15 +71,18 @@ class FileIndexer:
                     else:
                         results["errors"] += 1
             else:
-                # 新規ファイルの登録
-                if self._register_new_file(file_obj):
-                    results["new_files"] += 1
-                    results["details"].append({
-                        "action": "added",
-                        "file": file_obj.file_name
-                    })
-                else:
-                    results["errors"] += 1
+                # 新規ファイルはまとめて登録する
+                new_files.append(file_obj)
+        
+        # 新規ファイルの一括登録
+        registered_files = self._register_new_files(new_files)
+        results["new_files"] += len(registered_files)
+        results["errors"] += len(new_files) - len(registered_files)
+        for file_obj in registered_files:
+            results["details"].append({
+                "action": "added",
+                "file": file_obj.file_name
+            })
         
         # 削除されたファイルの処理
         for existing_path, existing_file in existing_paths.items():
@@ -115,7 +120,7 @@ class FileIndexer:
             return False
         
         # 既存チェック
-        existing_file = self.file_repo.find_by_path(file_path)
+        existing_file = self.file_repo.find_by_path(file_path, lite=True)
         
         if existing_file:
             # 更新
@@ -131,18 +136,44 @@ class FileIndexer:
             logger.info(f"新規ファイルを登録: {file_obj.file_name}")
             
             # 自動解析を実行
-            if self.auto_analyze and self.analyzer and created_file.id:
-                try:
-                    logger.info(f"自動解析を開始: {file_obj.file_name}")
-                    self.analyzer.analyze_file(created_file.id, force=False)
-                except Exception as e:
-                    logger.warning(f"自動解析に失敗: {file_obj.file_name}, {e}")
+            self._auto_analyze(created_file)
             
             return True
         except Exception as e:
             logger.error(f"ファイル登録エラー: {file_obj.file_name}, {e}")
             return False
     
+    def _register_new_files(self, files: List[File]) -> List[File]:
+        """新規ファイルを単一トランザクションで一括登録し、登録できたファイルを返す"""
+        if not files:
+            return []
+        
+        try:
+            self.file_repo.create_many(files)
+        except Exception as e:
+            # 一括登録はトランザクションごとロールバックされるため、1件ずつ登録し直す
+            logger.warning(f"一括登録に失敗したため個別に登録します: {e}")
+            return [file_obj for file_obj in files if self._register_new_file(file_obj)]
+        
+        # executemanyでは各行のIDが得られないため、自動解析時のみパスから引き直す
+        if self.auto_analyze and self.analyzer:
+            for file_obj in files:
+                created_file = self.file_repo.find_by_path(file_obj.file_path, lite=True)
+                if created_file:
+                    file_obj.id = created_file.id
+                    self._auto_analyze(file_obj)
+        
+        return files
+    
+    def _auto_analyze(self, file_obj: File) -> None:
+        """自動解析が有効な場合にファイルを解析"""
+        if self.auto_analyze and self.analyzer and file_obj.id:
+            try:
+                logger.info(f"自動解析を開始: {file_obj.file_name}")
+                self.analyzer.analyze_file(file_obj.id, force=False)
+            except Exception as e:
+                logger.warning(f"自動解析に失敗: {file_obj.file_name}, {e}")
+    
     def _update_file(self, existing_file: File, new_file: File) -> bool:
         """既存ファイルを更新し、必要に応じて再解析を実行"""
         try:
@@ -169,38 +200,27 @@ class FileIndexer:
     
     def get_index_status(self) -> Dict[str, Any]:
         """インデックスの状態を取得（データセット単位を含む）"""
-        all_files = self.file_repo.find_all()
+        columns = self.file_repo.find_all_columnar()
         
         status = {
-            "total_files": len(all_files),
-            "by_category": {},
-            "by_type": {},
+            "total_files": len(columns["id"]),
+            "by_category": dict(Counter(columns["category"])),
+            "by_type": dict(Counter(columns["file_type"])),
             "datasets": {},
-            "total_size": 0
+            "total_size": sum(columns["file_size"])
         }
         
-        for file in all_files:
-            # カテゴリー別集計
-            if file.category not in status["by_category"]:
-                status["by_category"][file.category] = 0
-            status["by_category"][file.category] += 1
-            
-            # タイプ別集計
-            if file.file_type not in status["by_type"]:
-                status["by_type"][file.file_type] = 0
-            status["by_type"][file.file_type] += 1
-            
-            # データセット別集計
-            if file.category == "datasets":
-                dataset_name = self.scanner._get_dataset_name(Path(file.file_path))
+        # データセット別集計
+        for file_path, category, file_size in zip(
+            columns["file_path"], columns["category"], columns["file_size"]
+        ):
+            if category == "datasets":
+                dataset_name = self.scanner._get_dataset_name(Path(file_path))
                 if dataset_name:
                     if dataset_name not in status["datasets"]:
                         status["datasets"][dataset_name] = {"files": 0, "size": 0}
                     status["datasets"][dataset_name]["files"] += 1
-                    status["datasets"][dataset_name]["size"] += file.file_size
-            
-            # 合計サイズ
-            status["total_size"] += file.file_size
+                    status["datasets"][dataset_name]["size"] += file_size
         
         # サイズを人間が読みやすい形式に変換
         status["total_size_mb"] = round(status["total_size"] / (1024 * 1024), 2)
@@ -149,11 +149,12 @@ class NewFileIndexer:
             dataset_id = created_dataset.id
             logger.info(f"新規データセットを作成: {dataset_name}")
         
-        # データセットファイルを登録
+        # データセットファイルを登録（未登録分をまとめて一括登録）
+        new_dataset_files = []
         for file_obj in files:
             existing_file = self.dataset_file_repo.find_by_path(file_obj.file_path)
             if not existing_file:
-                dataset_file = DatasetFile(
+                new_dataset_files.append(DatasetFile(
                     dataset_id=dataset_id,
                     file_path=file_obj.file_path,
                     file_name=file_obj.file_name,
@@ -162,8 +163,8 @@ class NewFileIndexer:
                     created_at=file_obj.created_at,
                     updated_at=file_obj.updated_at,
                     content_hash=file_obj.content_hash
-                )
-                self.dataset_file_repo.create(dataset_file)
+                ))
+        self.dataset_file_repo.create_many(new_dataset_files)
         
         # 自動解析を実行（未解析の場合のみ）
         if self.auto_analyze and self.analyzer:
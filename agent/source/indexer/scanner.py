@@ -1,8 +1,9 @@
 import os
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 import logging
 
 from tools.config import DATA_DIR, SUPPORTED_EXTENSIONS, MAX_FILE_SIZE_BYTES
@@ -10,13 +11,28 @@ from ..database.models import File
 
 logger = logging.getLogger(__name__)
 
+# パス要素（小文字）からカテゴリーへの対応表
+_PATH_PART_CATEGORIES = {
+    'paper': 'paper',
+    'papers': 'paper',
+    'poster': 'poster',
+    'posters': 'poster',
+    'dataset': 'datasets',
+    'datasets': 'datasets',
+}
+
+# ハッシュ計算の並列数（hashlibは計算中にGILを解放するためスレッドで並列化できる）
+HASH_MAX_WORKERS = os.cpu_count() or 1
+
 
 class FileScanner:
     """データディレクトリのファイルをスキャンするクラス"""
     
+    # 全エントリで判定するためfrozensetにしてO(1)で照合する
+    supported_extensions = frozenset(SUPPORTED_EXTENSIONS)
+    
     def __init__(self, data_dir: Optional[Path] = None):
         self.data_dir = data_dir or DATA_DIR
-        self.supported_extensions = SUPPORTED_EXTENSIONS
     
     def scan_directory(self) -> List[File]:
         """データディレクトリを再帰的にスキャンしてデータセット単位で管理"""
@@ -31,27 +47,64 @@ class FileScanner:
         # データセット単位でスキャン
         datasets_discovered = set()
         
-        for root, _, filenames in os.walk(self.data_dir):
-            for filename in filenames:
-                file_path = Path(root) / filename
-                
-                if self._should_process_file(file_path):
-                    file_obj = self._create_file_object(file_path)
-                    if file_obj:
-                        files.append(file_obj)
-                        
-                        # データセット名を記録
-                        if file_obj.category == "datasets":
-                            dataset_name = self._get_dataset_name(file_path)
-                            if dataset_name:
-                                datasets_discovered.add(dataset_name)
+        # 先に対象ファイルを列挙し、ハッシュ計算を含むオブジェクト作成はスレッドプールで行う
+        # 走査時に取得したstat結果をサイズ判定・オブジェクト作成で使い回す
+        candidates = [
+            (file_path, file_stat)
+            for file_path, file_stat in self._iter_files(self.data_dir)
+            if self._should_process_file(file_path, file_stat)
+        ]
+        paths = [file_path for file_path, _ in candidates]
+        stats = [file_stat for _, file_stat in candidates]
+        
+        with ThreadPoolExecutor(max_workers=HASH_MAX_WORKERS) as executor:
+            file_objs = executor.map(self._create_file_object, paths, stats)
+            
+            for file_path, file_obj in zip(paths, file_objs):
+                if file_obj:
+                    files.append(file_obj)
+                    
+                    # データセット名を記録
+                    if file_obj.category == "datasets":
+                        dataset_name = self._get_dataset_name(file_path)
+                        if dataset_name:
+                            datasets_discovered.add(dataset_name)
         
         logger.info(f"スキャン完了: {len(files)}個のファイルを発見")
         logger.info(f"データセット: {len(datasets_discovered)}個 ({', '.join(sorted(datasets_discovered))})")
         return files
     
-    def _should_process_file(self, file_path: Path) -> bool:
-        """ファイルを処理すべきか判定"""
+    def _iter_files(self, root: Path) -> Iterator[Tuple[Path, os.stat_result]]:
+        """os.scandirで再帰的に走査し、隠しファイル・未対応拡張子を除いたファイルパスとstat結果を返す"""
+        # Pathの生成は名前による絞り込みを通ったエントリのみに限定する
+        stack = [os.fspath(root)]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            name = entry.name
+                            if name.startswith('.'):
+                                continue
+                            if os.path.splitext(name)[1].lower() not in self.supported_extensions:
+                                continue
+                            try:
+                                # DirEntry側でキャッシュされ、以降のstat呼び出しは不要になる
+                                file_stat = entry.stat()
+                            except OSError as e:
+                                logger.error(f"ファイル情報の取得に失敗: {entry.path}, エラー: {e}")
+                                continue
+                            yield Path(entry.path), file_stat
+            except OSError as e:
+                logger.error(f"ディレクトリの読み込みに失敗: {current}, エラー: {e}")
+    
+    def _should_process_file(
+        self, file_path: Path, file_stat: Optional[os.stat_result] = None
+    ) -> bool:
+        """ファイルを処理すべきか判定（file_stat指定時はstatを再取得しない）"""
         # 隠しファイルをスキップ
         if file_path.name.startswith('.'):
             return False
@@ -62,7 +115,7 @@ class FileScanner:
         
         # ファイルサイズの確認
         try:
-            file_size = file_path.stat().st_size
+            file_size = (file_stat or file_path.stat()).st_size
             if file_size > MAX_FILE_SIZE_BYTES:
                 logger.warning(f"ファイルサイズが大きすぎます: {file_path} ({file_size} bytes)")
                 return False
@@ -72,10 +125,12 @@ class FileScanner:
         
         return True
     
-    def _create_file_object(self, file_path: Path) -> Optional[File]:
-        """ファイルオブジェクトを作成"""
+    def _create_file_object(
+        self, file_path: Path, file_stat: Optional[os.stat_result] = None
+    ) -> Optional[File]:
+        """ファイルオブジェクトを作成（file_stat指定時はstatを再取得しない）"""
         try:
-            stat = file_path.stat()
+            stat = file_stat or file_path.stat()
             
             # カテゴリーを判定
             category = self._determine_category(file_path)
@@ -107,12 +162,9 @@ class FileScanner:
         path_parts = file_path.parts
         
         for part in path_parts:
-            if part.lower() in ['paper', 'papers']:
-                return 'paper'
-            elif part.lower() in ['poster', 'posters']:
-                return 'poster'
-            elif part.lower() in ['dataset', 'datasets']:
-                return 'datasets'
+            category = _PATH_PART_CATEGORIES.get(part.lower())
+            if category:
+                return category
         
         # デフォルトはファイルタイプから推測
         if file_path.suffix.lower() == '.pdf':
@@ -142,13 +194,10 @@ class FileScanner:
     
     def _calculate_file_hash(self, file_path: Path) -> str:
         """ファイルのSHA256ハッシュを計算"""
-        sha256_hash = hashlib.sha256()
-        
         try:
+            # 読み込みとダイジェスト計算をCレベルで行い、計算中はGILを解放する
             with open(file_path, "rb") as f:
-                for byte_block in iter(lambda: f.read(4096), b""):
-                    sha256_hash.update(byte_block)
-            return sha256_hash.hexdigest()
+                return hashlib.file_digest(f, "sha256").hexdigest()
         except Exception as e:
             logger.error(f"ファイルハッシュの計算に失敗: {file_path}, エラー: {e}")
             return ""
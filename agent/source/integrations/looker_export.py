@@ -30,9 +30,9 @@ class LookerDataExporter:
         """サマリー統計データを収集"""
         try:
             # 各リポジトリから統計情報を取得
-            papers_count = len(self.paper_repo.find_all())
-            posters_count = len(self.poster_repo.find_all())
-            datasets_count = len(self.dataset_repo.find_all())
+            papers_count = self.paper_repo.count()
+            posters_count = self.poster_repo.count()
+            datasets_count = self.dataset_repo.count()
             
             # データセットの詳細情報
             all_datasets = self.dataset_repo.find_all()
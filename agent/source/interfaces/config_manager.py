@@ -31,7 +31,7 @@ import os
 import json
 import logging
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 from dataclasses import asdict
 
 try:
@@ -141,7 +141,8 @@ class PaaSConfigManager:
                 'text/plain'
             ]),
             sync_interval_minutes=int(os.getenv("GOOGLE_DRIVE_SYNC_INTERVAL", "60")),
-            batch_size=int(os.getenv("GOOGLE_DRIVE_BATCH_SIZE", "10"))
+            batch_size=int(os.getenv("GOOGLE_DRIVE_BATCH_SIZE", "10")),
+            download_cache_path=os.getenv("GOOGLE_DRIVE_DOWNLOAD_CACHE_PATH")
         )
     
     def _build_vector_search_config(self) -> VectorSearchConfig:
@@ -338,6 +339,14 @@ def init_config_manager(config_file_path: Optional[str] = None) -> PaaSConfigMan
 # Convenience Functions
 # ========================================
 
+# 機能名 → PaaSConfigManagerの設定取得メソッド名
+_FEATURE_CONFIG_GETTERS: Dict[str, str] = {
+    'google_drive': 'get_google_drive_config',
+    'vector_search': 'get_vector_search_config',
+    'authentication': 'get_auth_config',
+}
+
+
 def is_feature_enabled(feature_name: str) -> bool:
     """
     機能有効状態の簡易チェック
@@ -370,31 +379,19 @@ def get_feature_config(feature_name: str) -> Optional[Any]:
     Returns:
         対応する設定オブジェクト（機能無効時はNone）
     """
-    manager = get_config_manager()
-    
-    if feature_name == 'google_drive':
-        return manager.get_google_drive_config()
-    elif feature_name == 'vector_search':
-        return manager.get_vector_search_config()
-    elif feature_name == 'authentication':
-        return manager.get_auth_config()
-    else:
+    getter_name = _FEATURE_CONFIG_GETTERS.get(feature_name)
+    if getter_name is None:
         return None
+    
+    return getattr(get_config_manager(), getter_name)()
 
 
 # ========================================
 # Integration with Existing Config
 # ========================================
 
-def create_env_template():
-    """
-    環境変数テンプレートファイル作成
-    
-    Claude Code使用時の注意：
-    - 開発者が設定を理解しやすいようテンプレート提供
-    - 実際の認証情報は含めない
-    """
-    template_content = """# PaaS機能設定
+# 環境変数テンプレート内容
+_ENV_TEMPLATE = """# PaaS機能設定
 # 各機能を有効にするにはtrueに設定してください
 
 # Google Drive連携
@@ -402,6 +399,8 @@ ENABLE_GOOGLE_DRIVE=false
 GOOGLE_DRIVE_CREDENTIALS_PATH=/path/to/google_drive_credentials.json
 GOOGLE_DRIVE_MAX_FILE_SIZE_MB=100
 GOOGLE_DRIVE_SYNC_INTERVAL=60
+# 取り込み済みファイルの再ダウンロードを避けるキャッシュ（任意）
+# GOOGLE_DRIVE_DOWNLOAD_CACHE_PATH=./google_drive_download_cache.json
 
 # ベクトル検索
 ENABLE_VECTOR_SEARCH=false
@@ -424,13 +423,28 @@ API_PORT=8000
 DEBUG=false
 PAAS_ENVIRONMENT=development
 """
+
+
+def create_env_template(path: Union[str, Path] = ".env.template") -> Path:
+    """
+    環境変数テンプレートファイル作成
+    
+    Args:
+        path: 出力先パス（デフォルトはカレントディレクトリの.env.template）
+        
+    Returns:
+        Path: 作成したテンプレートファイルのパス
     
-    template_path = Path(".env.template")
-    with open(template_path, 'w', encoding='utf-8') as f:
-        f.write(template_content)
+    Claude Code使用時の注意：
+    - 開発者が設定を理解しやすいようテンプレート提供
+    - 実際の認証情報は含めない
+    """
+    template_path = Path(path)
+    template_path.write_text(_ENV_TEMPLATE, encoding='utf-8')
     
     print(f"環境変数テンプレートを作成しました: {template_path}")
     print("実際の設定には.envファイルを作成してください。")
+    return template_path
 
 
 if __name__ == "__main__":
@@ -276,6 +276,7 @@ class GoogleDriveConfig:
     ])
     sync_interval_minutes: int = 60
     batch_size: int = 10
+    download_cache_path: Optional[str] = None  # md5Checksum→配置先パスの対応を保存するJSON（Noneの場合はメモリのみ）
 
 
 @dataclass  
@@ -21,10 +21,13 @@ import asyncio
 import hashlib
 import json
 import os
+import re
+import shutil
 import tempfile
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 import logging
 
 # Google Drive API imports (認証設定後に有効化)
@@ -34,12 +37,21 @@ try:
     from google_auth_oauthlib.flow import Flow
     from googleapiclient.discovery import build
     from googleapiclient.errors import HttpError
-    from googleapiclient.http import MediaIoBaseDownload
+    from googleapiclient.http import MediaIoBaseDownload, build_http
+    from googleapiclient.model import JsonModel
+    import google_auth_httplib2
     GOOGLE_DRIVE_AVAILABLE = True
 except ImportError:
     GOOGLE_DRIVE_AVAILABLE = False
     logging.warning("Google Drive API libraries not available. Install: pip install google-api-python-client google-auth-oauthlib")
 
+# APIレスポンスのJSON解析を高速化（任意）
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from .input_ports import GoogleDrivePort
 from .data_models import (
     DocumentContent,
@@ -51,6 +63,85 @@ from .data_models import (
     InputError
 )
 
+# ファイルメタデータ取得時に要求するフィールド
+FILE_METADATA_FIELDS = 'id, name, size, mimeType, md5Checksum, createdTime, modifiedTime, parents'
+
+# 一覧取得1ページあたりの件数（Drive APIの上限）
+LIST_PAGE_SIZE = 1000
+
+# MIMEタイプからコンテンツタイプへの対応表
+_MIME_TO_CONTENT_TYPE = {
+    'application/pdf': 'pdf',
+    'text/csv': 'csv',
+    'application/json': 'json',
+    'text/plain': 'txt',
+    'application/jsonl': 'jsonl'
+}
+
+# ファイル名からのカテゴリ判定パターン（上から順に優先）
+_CATEGORY_PATTERNS = tuple(
+    (category, re.compile('|'.join(map(re.escape, keywords))))
+    for category, keywords in (
+        ('dataset', ('dataset', 'data', '.csv', '.json', '.jsonl')),
+        ('paper', ('paper', 'thesis', 'research')),
+        ('poster', ('poster', 'presentation')),
+    )
+)
+
+# ダウンロード1回あたりの取得サイズ（ライブラリ既定の100MiBでは並行数×100MiBをメモリに保持してしまう）
+DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+if GOOGLE_DRIVE_AVAILABLE and ORJSON_AVAILABLE:
+    class _OrjsonJsonModel(JsonModel):
+        """レスポンス本文をorjsonで解析するJsonModel（大きな一覧取得で効く）"""
+        
+        def deserialize(self, content):
+            try:
+                body = orjson.loads(content)
+            except orjson.JSONDecodeError:
+                # JSON以外の本文は標準の処理に任せる
+                return super().deserialize(content)
+            if self._data_wrapper and isinstance(body, dict) and "data" in body:
+                body = body["data"]
+            return body
+
+
+def _response_model() -> Any:
+    """サービス構築時に使うレスポンスモデル（Noneの場合はライブラリ既定のJsonModel）"""
+    if GOOGLE_DRIVE_AVAILABLE and ORJSON_AVAILABLE:
+        return _OrjsonJsonModel()
+    return None
+
+
+# 構築済みDrive APIサービス（全ポートで共有）
+_drive_service: Any = None
+_drive_service_lock = threading.Lock()
+
+
+def _get_drive_service() -> Any:
+    """
+    Drive APIサービスを取得（プロセス内で1度だけ構築して共有）
+    
+    ディスカバリー文書の読み込み・解析はポートを作るたびに行うと重いため、
+    同梱のディスカバリー文書（static_discovery）を使い、結果を共有する。
+    共有するサービスには認証情報を持たせない。認証情報付きで共有すると、
+    バッチのサブリクエストなどrequest.httpから認証情報を取り出す処理で
+    最初に構築したポートのトークンが使われてしまうため。
+    リクエストは必ず各ポートの認証済みHTTP接続を指定して実行する（_execute参照）。
+    """
+    global _drive_service
+    if _drive_service is None:
+        with _drive_service_lock:
+            if _drive_service is None:
+                _drive_service = build(
+                    'drive', 'v3',
+                    http=build_http(),
+                    static_discovery=True,
+                    cache_discovery=False,
+                    model=_response_model()
+                )
+    return _drive_service
+
 
 class GoogleDrivePortImpl(GoogleDrivePort):
     """
@@ -72,13 +163,23 @@ class GoogleDrivePortImpl(GoogleDrivePort):
             config: Google Drive設定
         """
         self.config = config
+        self._supported_mime_types = frozenset(config.supported_mime_types)
+        # 一覧取得時にサーバー側で対象形式に絞り込むための条件
+        self._mime_type_query = " or ".join(
+            f"mimeType='{mime_type}'" for mime_type in sorted(self._supported_mime_types)
+        )
         self.service = None
         self.credentials = None
+        # API呼び出しを実行するスレッドごとのHTTP接続
+        self._http_local = threading.local()
         self.job_registry: Dict[str, IngestionResult] = {}
         
         # 既存システムとの統合用
         self._indexer = None
         
+        # 取り込み済みファイルのキャッシュ（md5Checksum → 配置先パス・ハッシュ・サイズ）
+        self._download_cache: Dict[str, Dict[str, Any]] = self._load_download_cache()
+        
         if not GOOGLE_DRIVE_AVAILABLE:
             logging.warning("Google Drive API not available - running in mock mode")
     
@@ -144,10 +245,10 @@ class GoogleDrivePortImpl(GoogleDrivePort):
                 self.credentials.refresh(Request())
             
             # Google Drive APIサービス構築
-            self.service = build('drive', 'v3', credentials=self.credentials)
+            self.service = _get_drive_service()
             
             # 接続テスト
-            test_result = self.service.about().get(fields='user').execute()
+            test_result = await self._execute(self.service.about().get(fields='user'))
             logging.info(f"Google Drive authentication successful for: {test_result.get('user', {}).get('emailAddress', 'Unknown')}")
             
             return True
@@ -182,22 +283,21 @@ class GoogleDrivePortImpl(GoogleDrivePort):
             else:
                 query += " and 'root' in parents"
             
-            # フォルダ一覧取得
-            results = self.service.files().list(
+            # フォルダ一覧取得（全ページ）
+            folders = []
+            async for page in self._iter_list_pages(
                 q=query,
                 fields='nextPageToken, files(id, name, createdTime, modifiedTime, parents)'
-            ).execute()
-            
-            folders = []
-            for item in results.get('files', []):
-                folders.append({
-                    'id': item['id'],
-                    'name': item['name'],
-                    'type': 'folder',
-                    'created_time': item.get('createdTime'),
-                    'modified_time': item.get('modifiedTime'),
-                    'parent_id': parent_folder_id
-                })
+            ):
+                for item in page:
+                    folders.append({
+                        'id': item['id'],
+                        'name': item['name'],
+                        'type': 'folder',
+                        'created_time': item.get('createdTime'),
+                        'modified_time': item.get('modifiedTime'),
+                        'parent_id': parent_folder_id
+                    })
             
             logging.info(f"Found {len(folders)} folders in parent: {parent_folder_id or 'root'}")
             return folders
@@ -250,31 +350,43 @@ class GoogleDrivePortImpl(GoogleDrivePort):
             
             logging.info(f"Found {len(files)} files in folder {folder_id}")
             
-            # 2. サポート形式でフィルタリング
-            supported_files = []
-            for file_info in files:
-                if self._is_supported_mime_type(file_info.get('mimeType', '')):
-                    supported_files.append(file_info)
-                else:
-                    logging.info(f"Skipping unsupported file: {file_info['name']} ({file_info.get('mimeType', 'unknown')})")
+            # 2. サポート形式での絞り込みは一覧取得時にサーバー側で行っている（_list_files_in_folder）。
+            #    対象形式が1つも設定されていない場合はサーバー側の条件を付けられないため、同期対象なしとする
+            if self._supported_mime_types:
+                supported_files = files
+            else:
+                logging.info("No supported MIME types configured; skipping all files")
+                supported_files = []
             
             result.total_files = len(supported_files)
             logging.info(f"Processing {len(supported_files)} supported files")
             
-            # 3. 各ファイルをダウンロード・処理
-            for file_info in supported_files:
-                try:
-                    await self._process_single_file(file_info, result, user_context)
-                    result.successful_files += 1
-                except Exception as e:
-                    error_msg = f"Failed to process {file_info['name']}: {e}"
-                    result.errors.append(error_msg)
-                    result.failed_files += 1
-                    logging.error(error_msg)
-                finally:
-                    result.processed_files += 1
-                    # プログレス更新
-                    self.job_registry[job_id] = result
+            # 3. 各ファイルをダウンロード・処理（最大batch_size件を並行実行）
+            # 各コルーチンは同じイベントループ上で動くため、resultのカウンタ・リストや
+            # _download_cacheの更新はawaitを挟まない限り他のコルーチンと競合しない。
+            # ロックを使わない代わりに、読み出しから書き込みまでの間にawaitを入れないこと。
+            semaphore = asyncio.Semaphore(max(1, self.config.batch_size))
+            
+            async def _process_one(file_info: Dict[str, Any]) -> None:
+                async with semaphore:
+                    try:
+                        await self._process_single_file(file_info, result, user_context)
+                        result.successful_files += 1
+                    except Exception as e:
+                        error_msg = f"Failed to process {file_info['name']}: {e}"
+                        result.errors.append(error_msg)
+                        result.failed_files += 1
+                        logging.error(error_msg)
+                    finally:
+                        # job_registryは同じresultを参照しているため、ここでの更新がそのまま進捗になる
+                        result.processed_files += 1
+            
+            try:
+                await asyncio.gather(*(_process_one(file_info) for file_info in supported_files))
+            finally:
+                # ジョブ単位の一時ディレクトリを削除（ファイルごとのディレクトリは処理時に削除済み）
+                shutil.rmtree(self._job_temp_dir(job_id), ignore_errors=True)
+            self._save_download_cache()
             
             # ジョブ完了
             result.status = JobStatus.COMPLETED
@@ -312,24 +424,44 @@ class GoogleDrivePortImpl(GoogleDrivePort):
         
         try:
             # ファイルメタデータ取得
-            file_metadata = self.service.files().get(fileId=file_id).execute()
-            
+            file_metadata = await self._execute(self.service.files().get(
+                fileId=file_id,
+                fields=FILE_METADATA_FIELDS
+            ))
+        except HttpError as e:
+            logging.error(f"Failed to download file {file_id}: {e}")
+            raise InputError(f"Failed to download file: {e}", "DOWNLOAD_FAILED")
+        
+        return await self._download_with_metadata(file_id, target_path, file_metadata)
+    
+    async def _download_with_metadata(
+        self,
+        file_id: str,
+        target_path: Path,
+        file_metadata: Dict[str, Any]
+    ) -> DocumentContent:
+        """取得済みのメタデータを使ってファイルをダウンロード"""
+        try:
             # ファイルダウンロード
             request = self.service.files().get_media(fileId=file_id)
+            # チャンク取得は別スレッドで行うため、スレッドセーフでない共有接続ではなく専用の接続を使う
+            request.http = self._new_authorized_http()
             
             target_path.parent.mkdir(parents=True, exist_ok=True)
             
+            loop = asyncio.get_running_loop()
             with open(target_path, 'wb') as file_handle:
-                downloader = MediaIoBaseDownload(file_handle, request)
+                downloader = MediaIoBaseDownload(
+                    file_handle, request, chunksize=DOWNLOAD_CHUNK_SIZE
+                )
                 done = False
                 while done is False:
-                    status, done = downloader.next_chunk()
-            
-            # ファイル情報読み取り
-            file_size = target_path.stat().st_size
+                    # 通信待ちの間も他ファイルの処理が進むようイベントループを塞がない
+                    status, done = await loop.run_in_executor(None, downloader.next_chunk)
             
-            # コンテンツハッシュ計算
-            content_hash = self._calculate_file_hash(target_path)
+            # ファイル情報読み取り・コンテンツハッシュ計算
+            # ファイル全体を読むため、並行中の他のダウンロードを止めないようスレッドで実行
+            file_size, content_hash = await asyncio.to_thread(self._stat_and_hash, target_path)
             
             # DocumentContent作成
             document_content = DocumentContent(
@@ -373,20 +505,12 @@ class GoogleDrivePortImpl(GoogleDrivePort):
             raise InputError("Google Drive not authenticated", "NOT_AUTHENTICATED")
         
         try:
-            file_metadata = self.service.files().get(
+            file_metadata = await self._execute(self.service.files().get(
                 fileId=file_id,
-                fields='id, name, size, mimeType, createdTime, modifiedTime, parents'
-            ).execute()
-            
-            return {
-                'id': file_metadata['id'],
-                'name': file_metadata['name'],
-                'size': int(file_metadata.get('size', 0)),
-                'mimeType': file_metadata.get('mimeType'),
-                'createdTime': file_metadata.get('createdTime'),
-                'modifiedTime': file_metadata.get('modifiedTime'),
-                'parents': file_metadata.get('parents', [])
-            }
+                fields=FILE_METADATA_FIELDS
+            ))
+            
+            return self._normalize_file_metadata(file_metadata)
             
         except HttpError as e:
             logging.error(f"Failed to get file metadata {file_id}: {e}")
@@ -404,14 +528,16 @@ class GoogleDrivePortImpl(GoogleDrivePort):
         """フォルダ内ファイル一覧取得（再帰対応）"""
         files = []
         
-        # 直下のファイル取得
-        query = f"'{folder_id}' in parents and mimeType!='application/vnd.google-apps.folder'"
-        results = self.service.files().list(
+        # 直下のファイル取得（サポート形式のみをサーバー側で絞り込む）
+        if self._mime_type_query:
+            query = f"'{folder_id}' in parents and ({self._mime_type_query})"
+        else:
+            query = f"'{folder_id}' in parents and mimeType!='application/vnd.google-apps.folder'"
+        async for page in self._iter_list_pages(
             q=query,
-            fields='nextPageToken, files(id, name, size, mimeType, createdTime, modifiedTime, parents)'
-        ).execute()
-        
-        files.extend(results.get('files', []))
+            fields=f'nextPageToken, files({FILE_METADATA_FIELDS})'
+        ):
+            files.extend(page)
         
         # 再帰処理
         if recursive:
@@ -423,28 +549,86 @@ class GoogleDrivePortImpl(GoogleDrivePort):
         
         return files
     
-    def _is_supported_mime_type(self, mime_type: str) -> bool:
-        """サポート対象ファイル形式チェック"""
-        return mime_type in self.config.supported_mime_types
+    async def _iter_list_pages(self, **list_params: Any) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        files().listの結果をページ単位で返す非同期ジェネレーター
+        
+        現在のページを返している間に次ページのリクエストを先行して発行し、
+        ページ間の通信待ちを呼び出し側の処理と重ねる。
+        """
+        def _list_request(page_token: Optional[str] = None) -> Any:
+            return self.service.files().list(
+                pageSize=LIST_PAGE_SIZE, pageToken=page_token, **list_params
+            )
+        
+        results = await self._execute(_list_request())
+        next_page: Optional[asyncio.Future] = None
+        try:
+            while True:
+                next_token = results.get('nextPageToken')
+                next_page = (
+                    asyncio.ensure_future(self._execute(_list_request(next_token)))
+                    if next_token else None
+                )
+                yield results.get('files', [])
+                if next_page is None:
+                    return
+                page, next_page = next_page, None
+                results = await page
+        finally:
+            # 呼び出し側が途中で止めた場合や例外時は先行取得を取り消し、結果を回収しておく
+            # （回収しないと失敗時に "Task exception was never retrieved" が出る）
+            if next_page is not None:
+                next_page.cancel()
+                try:
+                    await next_page
+                except (asyncio.CancelledError, Exception):
+                    pass
+    
+    async def _execute(self, request: Any) -> Any:
+        """APIリクエスト（バッチ含む）をワーカースレッドで実行し、イベントループを塞がない"""
+        return await asyncio.to_thread(lambda: request.execute(http=self._thread_http()))
+    
+    def _thread_http(self) -> "google_auth_httplib2.AuthorizedHttp":
+        """実行中スレッド専用のHTTP接続を取得（スレッド内では接続を再利用する）"""
+        local = self._http_local
+        if getattr(local, 'http', None) is None or local.credentials is not self.credentials:
+            local.http = self._new_authorized_http()
+            local.credentials = self.credentials
+        return local.http
+    
+    def _new_authorized_http(self) -> "google_auth_httplib2.AuthorizedHttp":
+        """認証情報付きの新しいHTTP接続を作成（httplib2.Httpはスレッド間で共有できない）"""
+        # build_httpはライブラリ既定のタイムアウト（60秒）とリダイレクト設定を適用する。
+        # タイムアウトなしだと応答のない接続でワーカースレッドとセマフォ枠を占有し続ける
+        return google_auth_httplib2.AuthorizedHttp(self.credentials, http=build_http())
+    
+    def _normalize_file_metadata(self, file_metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Drive APIのファイル情報を共通のメタデータ形式に変換"""
+        return {
+            'id': file_metadata['id'],
+            'name': file_metadata['name'],
+            'size': int(file_metadata.get('size', 0)),
+            'mimeType': file_metadata.get('mimeType'),
+            'md5Checksum': file_metadata.get('md5Checksum'),
+            'createdTime': file_metadata.get('createdTime'),
+            'modifiedTime': file_metadata.get('modifiedTime'),
+            'parents': file_metadata.get('parents', [])
+        }
     
     def _get_content_type_from_mime(self, mime_type: str) -> str:
         """MIMEタイプからコンテンツタイプ変換"""
-        mime_mapping = {
-            'application/pdf': 'pdf',
-            'text/csv': 'csv',
-            'application/json': 'json',
-            'text/plain': 'txt',
-            'application/jsonl': 'jsonl'
-        }
-        return mime_mapping.get(mime_type, 'unknown')
+        return _MIME_TO_CONTENT_TYPE.get(mime_type, 'unknown')
+    
+    def _stat_and_hash(self, file_path: Path) -> Tuple[int, str]:
+        """ファイルサイズとコンテンツハッシュを取得（ワーカースレッドで実行）"""
+        return file_path.stat().st_size, self._calculate_file_hash(file_path)
     
     def _calculate_file_hash(self, file_path: Path) -> str:
-        """ファイルハッシュ計算"""
-        hash_sha256 = hashlib.sha256()
+        """ファイルハッシュ計算（既存システムのcontent_hashと揃えるためSHA-256）"""
+        # 読み込みとダイジェスト計算をCレベルで行い、計算中はGILを解放する
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
-        return hash_sha256.hexdigest()
+            return hashlib.file_digest(f, 'sha256').hexdigest()
     
     async def _process_single_file(
         self,
@@ -455,29 +639,55 @@ class GoogleDrivePortImpl(GoogleDrivePort):
         """単一ファイルの処理（ダウンロード + 既存システム統合）"""
         file_id = file_info['id']
         file_name = file_info['name']
+        md5_checksum = file_info.get('md5Checksum')
+        
+        # 同じ内容を取り込み済みで配置先が残っていればダウンロードを省略
+        cached = self._download_cache.get(md5_checksum) if md5_checksum else None
+        if cached and Path(cached['path']).exists():
+            result.processed_documents.append(DocumentMetadata(
+                id=0,  # 既存システムで設定される
+                category=self._determine_category(file_name),
+                file_path=cached['path'],
+                file_name=file_name,
+                file_size=cached['file_size'],
+                created_at=datetime.now(),
+                updated_at=datetime.now(),
+                content_hash=cached['content_hash'],
+                source_type='google_drive',
+                external_id=file_id
+            ))
+            logging.info(f"Skipping download of unchanged file: {file_name} -> {cached['path']}")
+            return
         
-        # 一時ファイルパス生成
-        temp_dir = Path(f"/tmp/paas_temp/{result.job_id}")
+        # 一時ファイルパス生成（並行処理時の同名ファイル衝突を避けるためファイルIDごとに分ける）
+        temp_dir = self._job_temp_dir(result.job_id) / file_id
         temp_dir.mkdir(parents=True, exist_ok=True)
         temp_file_path = temp_dir / file_name
         
         try:
-            # 1. ファイルダウンロード
-            document_content = await self.download_file(file_id, temp_file_path, user_context)
+            # 1. ファイルダウンロード（一覧取得時のメタデータを再利用し、ファイルごとのget呼び出しを省く）
+            document_content = await self._download_with_metadata(file_id, temp_file_path, file_info)
             
             # 2. 既存システムとの統合
-            success = await self._integrate_with_existing_system(
+            target_path = await self._integrate_with_existing_system(
                 str(temp_file_path),
                 document_content,
                 user_context
             )
             
-            if success:
+            if target_path:
+                if md5_checksum:
+                    self._download_cache[md5_checksum] = {
+                        'path': str(target_path),
+                        'content_hash': document_content.content_hash,
+                        'file_size': document_content.file_size
+                    }
+                
                 # DocumentMetadata作成
                 doc_metadata = DocumentMetadata(
                     id=0,  # 既存システムで設定される
                     category=self._determine_category(file_name),
-                    file_path=str(temp_file_path),
+                    file_path=str(target_path),
                     file_name=file_name,
                     file_size=document_content.file_size,
                     created_at=datetime.now(),
@@ -493,20 +703,23 @@ class GoogleDrivePortImpl(GoogleDrivePort):
                 raise Exception("Failed to integrate with existing system")
                 
         finally:
-            # 一時ファイル削除
-            if temp_file_path.exists():
-                temp_file_path.unlink()
+            # 一時ファイルとファイルごとの一時ディレクトリを削除
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def _job_temp_dir(self, job_id: str) -> Path:
+        """ジョブごとの一時ダウンロードディレクトリ"""
+        return Path(f"/tmp/paas_temp/{job_id}")
     
     async def _integrate_with_existing_system(
         self,
         file_path: str,
         document_content: DocumentContent,
         user_context: Optional[UserContext] = None
-    ) -> bool:
-        """既存NewFileIndexerシステムとの統合"""
+    ) -> Optional[Path]:
+        """既存NewFileIndexerシステムとの統合（成功時は配置先パス、失敗時はNone）"""
         try:
             # 統合ヘルパー関数を使用（input_ports.pyで定義済み）
-            from .input_ports import integrate_with_existing_indexer
+            from .input_ports import integrate_file_with_existing_indexer
             
             # カテゴリ判定（メタデータから）
             category = None
@@ -521,39 +734,58 @@ class GoogleDrivePortImpl(GoogleDrivePort):
                 category = self._determine_category(original_name)
             
             # 統合実行
-            success = await integrate_with_existing_indexer(
+            target_path = await integrate_file_with_existing_indexer(
                 file_path=file_path,
                 category=category,
                 target_name=original_name
             )
             
-            if success:
-                logging.info(f"Successfully integrated with existing system: {original_name} -> {category}")
-                return True
-            else:
-                logging.error(f"Failed to integrate with existing system: {original_name}")
-                return False
+            logging.info(f"Successfully integrated with existing system: {original_name} -> {category}")
+            return target_path
             
         except Exception as e:
             logging.error(f"Failed to integrate with existing system: {e}")
-            return False
+            return None
+    
+    def _load_download_cache(self) -> Dict[str, Dict[str, Any]]:
+        """取り込み済みファイルのキャッシュを読み込み（設定がない・読めない場合は空）"""
+        cache_path = self.config.download_cache_path
+        if not cache_path or not os.path.exists(cache_path):
+            return {}
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Failed to load download cache {cache_path}: {e}")
+            return {}
+    
+    def _save_download_cache(self) -> None:
+        """取り込み済みファイルのキャッシュを保存（一時ファイル経由で置き換え）"""
+        cache_path = self.config.download_cache_path
+        if not cache_path:
+            return
+        try:
+            Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+            temp_path = f"{cache_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._download_cache, f, ensure_ascii=False)
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            logging.warning(f"Failed to save download cache {cache_path}: {e}")
     
     def _determine_category(self, file_name: str) -> str:
         """ファイル名からカテゴリ判定"""
         file_name_lower = file_name.lower()
         
-        if any(keyword in file_name_lower for keyword in ['dataset', 'data', '.csv', '.json', '.jsonl']):
-            return 'dataset'
-        elif any(keyword in file_name_lower for keyword in ['paper', 'thesis', 'research']):
-            return 'paper'
-        elif any(keyword in file_name_lower for keyword in ['poster', 'presentation']):
-            return 'poster'
+        for category, pattern in _CATEGORY_PATTERNS:
+            if pattern.search(file_name_lower):
+                return category
+        
+        # デフォルトはファイル拡張子で判定
+        if file_name_lower.endswith('.pdf'):
+            return 'paper'  # PDFは論文として扱う
         else:
-            # デフォルトはファイル拡張子で判定
-            if file_name_lower.endswith('.pdf'):
-                return 'paper'  # PDFは論文として扱う
-            else:
-                return 'dataset'
+            return 'dataset'
     
     # ========================================
     # Job Management Methods
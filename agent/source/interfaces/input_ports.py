@@ -17,9 +17,15 @@ Claude Code実装ガイダンス：
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any, AsyncIterator
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, AsyncIterator, Set, Tuple
 from pathlib import Path
 import asyncio
+import itertools
+import os
+import re
+import shutil
+import threading
 
 from .data_models import (
     DocumentContent,
@@ -467,65 +473,35 @@ async def integrate_with_existing_indexer(
     )
     ```
     """
+    await integrate_file_with_existing_indexer(file_path, category, target_name)
+    return True
+
+
+async def integrate_file_with_existing_indexer(
+    file_path: str,
+    category: Optional[str] = None,
+    target_name: Optional[str] = None
+) -> Path:
+    """
+    既存NewFileIndexerとの連携（配置先パスを返す版）
+    
+    Args:
+        file_path: 処理対象ファイルパス（一時ファイル）
+        category: 'dataset', 'paper', 'poster' または None（自動判定）
+        target_name: ファイル名（Google Drive等での元ファイル名）
+    
+    Returns:
+        Path: データディレクトリ内の配置先パス
+    """
     try:
-        import shutil
-        from pathlib import Path
-        from ..indexer.new_indexer import NewFileIndexer
-        
-        source_path = Path(file_path)
-        if not source_path.exists():
-            raise InputError(f"Source file not found: {file_path}")
-        
-        # ファイル名決定
-        final_filename = target_name or source_path.name
-        
-        # カテゴリ判定
-        if not category:
-            category = _determine_file_category(final_filename, source_path)
-        
-        # 適切なディレクトリにファイル配置
-        target_path = _get_target_path(category, final_filename)
-        
-        # ディレクトリ作成
-        target_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # ファイル移動（同名ファイルがある場合は上書き回避）
-        if target_path.exists():
-            stem = target_path.stem
-            suffix = target_path.suffix
-            counter = 1
-            while target_path.exists():
-                target_path = target_path.parent / f"{stem}_{counter}{suffix}"
-                counter += 1
-        
-        # ファイルコピー
-        shutil.copy2(source_path, target_path)
-        
-        # NewFileIndexerで直接処理
-        indexer = NewFileIndexer(auto_analyze=True)
-        
-        # 単一ファイルのスキャン・インデックス処理
-        if category == "dataset":
-            # データセットの場合は全体を再スキャン（データセット単位管理のため）
-            results = indexer.index_all_files()
-        else:
-            # 論文・ポスターの場合は個別処理
-            # 新構造用ファイルオブジェクト作成
-            file_obj = _create_new_file_object(target_path, category)
-            
-            if category == "paper":
-                success = indexer._process_paper(file_obj)
-            elif category == "poster":
-                success = indexer._process_poster(file_obj)
-            else:
-                raise InputError(f"Unsupported category: {category}")
-            
-            if not success:
-                raise InputError(f"Failed to process {category} file")
+        # ファイル配置・PDF解析・DB登録はブロッキング処理のため、イベントループを塞がないようスレッドで実行
+        final_filename, target_path, category = await asyncio.to_thread(
+            _integrate_file_sync, file_path, category, target_name
+        )
         
         import logging
         logging.info(f"Successfully integrated file: {final_filename} -> {target_path} ({category})")
-        return True
+        return target_path
         
     except Exception as e:
         import logging
@@ -533,6 +509,268 @@ async def integrate_with_existing_indexer(
         raise InputError(f"Failed to integrate with existing indexer: {e}")
 
 
+async def integrate_batch_with_existing_indexer(
+    files: List[Tuple[str, Optional[str], Optional[str]]]
+) -> List[Optional[Path]]:
+    """
+    複数ファイルをまとめて既存NewFileIndexerと連携
+    
+    NewFileIndexerの生成とデータセットの全体再スキャンをバッチ全体で1回に抑える。
+    一部のファイルが失敗しても他のファイルの処理は続け、失敗したファイルの
+    配置済みコピーは削除する（再実行時に name_1 のような重複を作らないため）。
+    
+    Args:
+        files: (処理対象ファイルパス, カテゴリ, ファイル名) のリスト。
+            カテゴリ・ファイル名はintegrate_with_existing_indexerと同様にNoneで自動判定
+    
+    Returns:
+        List[Optional[Path]]: 入力順の配置先パス（失敗したファイルはNone）
+    """
+    if not files:
+        return []
+    
+    try:
+        placed = await asyncio.to_thread(_integrate_batch_sync, files)
+    except Exception as e:
+        import logging
+        logging.error(f"Failed to integrate batch with existing indexer: {e}")
+        raise InputError(f"Failed to integrate batch with existing indexer: {e}")
+    
+    import logging
+    for entry in placed:
+        if entry is not None:
+            final_filename, target_path, category = entry
+            logging.info(f"Successfully integrated file: {final_filename} -> {target_path} ({category})")
+    return [entry[1] if entry is not None else None for entry in placed]
+
+
+# 並行実行時に同名ファイルの配置先が衝突しないよう、配置先の決定（予約）を直列化する
+_placement_lock = threading.Lock()
+
+# データセットの全体再スキャンは同時に1つだけ実行する
+_dataset_index_lock = threading.Lock()
+
+
+def _integrate_file_sync(
+    file_path: str,
+    category: Optional[str],
+    target_name: Optional[str]
+) -> Tuple[str, Path, str]:
+    """
+    integrate_with_existing_indexerの同期処理本体（ワーカースレッドで実行）
+    
+    Returns:
+        tuple: (ファイル名, 配置先パス, カテゴリ)
+    """
+    from ..indexer.new_indexer import NewFileIndexer
+    
+    final_filename, target_path, category = _place_file(file_path, category, target_name)
+    
+    # NewFileIndexerで直接処理
+    indexer = NewFileIndexer(auto_analyze=True)
+    
+    # 単一ファイルのスキャン・インデックス処理
+    if category == "dataset":
+        # データセットの場合は全体を再スキャン（データセット単位管理のため）
+        with _dataset_index_lock:
+            indexer.index_all_files()
+    else:
+        # 論文・ポスターの場合は個別処理
+        _index_placed_file(indexer, target_path, category)
+    
+    return final_filename, target_path, category
+
+
+def _integrate_batch_sync(
+    files: List[Tuple[str, Optional[str], Optional[str]]]
+) -> List[Optional[Tuple[str, Path, str]]]:
+    """
+    integrate_batch_with_existing_indexerの同期処理本体（ワーカースレッドで実行）
+    
+    全ファイルを配置してから1つのNewFileIndexerで処理し、
+    データセットの全体再スキャンはバッチ内で1回だけ行う
+    
+    Returns:
+        list: 入力順の (ファイル名, 配置先パス, カテゴリ)。失敗したファイルはNone
+    """
+    import logging
+    from ..indexer.new_indexer import NewFileIndexer
+    
+    # 同じ親ディレクトリへのmkdirはバッチ内で1回に抑える
+    created_dirs: Set[Path] = set()
+    placed: List[Optional[Tuple[str, Path, str]]] = []
+    for file_path, category, target_name in files:
+        try:
+            placed.append(_place_file(file_path, category, target_name, created_dirs))
+        except Exception as e:
+            logging.error(f"Failed to place file: {file_path}, error: {e}")
+            placed.append(None)
+    
+    def _fail(indices: List[int], error: Exception) -> None:
+        """インデックス登録に失敗したファイルの配置済みコピーを削除して失敗扱いにする"""
+        for index in indices:
+            _, target_path, _ = placed[index]
+            logging.error(f"Failed to index file: {target_path}, error: {error}")
+            target_path.unlink(missing_ok=True)
+            placed[index] = None
+    
+    placed_indices = [index for index, entry in enumerate(placed) if entry is not None]
+    if not placed_indices:
+        return placed
+    
+    try:
+        indexer = NewFileIndexer(auto_analyze=True)
+    except Exception as e:
+        _fail(placed_indices, e)
+        return placed
+    
+    dataset_indices = []
+    for index in placed_indices:
+        _, target_path, category = placed[index]
+        if category == "dataset":
+            dataset_indices.append(index)
+            continue
+        try:
+            _index_placed_file(indexer, target_path, category)
+        except Exception as e:
+            _fail([index], e)
+    
+    if dataset_indices:
+        try:
+            with _dataset_index_lock:
+                indexer.index_all_files()
+        except Exception as e:
+            _fail(dataset_indices, e)
+    
+    return placed
+
+
+def _place_file(
+    file_path: str,
+    category: Optional[str],
+    target_name: Optional[str],
+    created_dirs: Optional[Set[Path]] = None
+) -> Tuple[str, Path, str]:
+    """
+    ファイルをカテゴリに応じたデータディレクトリへコピー
+    
+    Args:
+        created_dirs: 作成済みディレクトリの記録（バッチ処理時のみ指定）
+    
+    Returns:
+        tuple: (ファイル名, 配置先パス, カテゴリ)
+    """
+    source_path = Path(file_path)
+    if not source_path.exists():
+        raise InputError(f"Source file not found: {file_path}")
+    
+    # ファイル名決定
+    final_filename = target_name or source_path.name
+    
+    # カテゴリ判定
+    if not category:
+        category = _determine_file_category(final_filename, source_path)
+    
+    # 適切なディレクトリにファイル配置
+    target_path = _get_target_path(category, final_filename)
+    
+    # ディレクトリ作成
+    parent_dir = target_path.parent
+    if created_dirs is None or parent_dir not in created_dirs:
+        parent_dir.mkdir(parents=True, exist_ok=True)
+        if created_dirs is not None:
+            created_dirs.add(parent_dir)
+    
+    # 配置先の名前の予約だけをロック内で行い、コピーはロック外で並行させる
+    with _placement_lock:
+        target_path = _reserve_target_path(target_path)
+    
+    # ファイルコピー（予約した空ファイルに上書き）
+    try:
+        _fast_copy(source_path, target_path)
+    except BaseException:
+        target_path.unlink(missing_ok=True)
+        raise
+    
+    return final_filename, target_path, category
+
+
+def _reserve_target_path(target_path: Path) -> Path:
+    """
+    同名ファイルを避けた配置先を決め、空ファイルを排他作成して予約
+    
+    O_EXCLはシンボリックリンク（リンク切れを含む）も既存として扱う。
+    同名ファイルがある場合は stem_1, stem_2 ... の順で空きを探す。
+    """
+    # 候補ごとのPath生成を避け、文字列のまま作成を試みる
+    candidate = str(target_path)
+    parent = str(target_path.parent)
+    stem = target_path.stem
+    suffix = target_path.suffix
+    counter = 1
+    while True:
+        try:
+            fd = os.open(candidate, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+        except FileExistsError:
+            candidate = os.path.join(parent, f"{stem}_{counter}{suffix}")
+            counter += 1
+            continue
+        os.close(fd)
+        return Path(candidate)
+
+
+def _index_placed_file(indexer, target_path: Path, category: str) -> None:
+    """配置済みの論文・ポスターを個別にインデックス登録"""
+    # 新構造用ファイルオブジェクト作成
+    file_obj = _create_new_file_object(target_path, category)
+    
+    if category == "paper":
+        success = indexer._process_paper(file_obj)
+    elif category == "poster":
+        success = indexer._process_poster(file_obj)
+    else:
+        raise InputError(f"Unsupported category: {category}")
+    
+    if not success:
+        raise InputError(f"Failed to process {category} file")
+
+
+# copy_file_range 1回あたりのコピー量
+COPY_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+def _fast_copy(source_path: Path, target_path: Path) -> None:
+    """
+    ファイルコピー（shutil.copy2互換）
+    
+    os.copy_file_rangeでカーネル内コピー（対応FSではreflink）を行い、
+    未対応環境やエラー時はshutil.copy2にフォールバックする
+    """
+    if not hasattr(os, 'copy_file_range'):
+        shutil.copy2(source_path, target_path)
+        return
+    
+    try:
+        with open(source_path, 'rb') as fsrc, open(target_path, 'wb') as fdst:
+            src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+            while os.copy_file_range(src_fd, dst_fd, COPY_CHUNK_SIZE):
+                pass
+    except OSError:
+        # EXDEV・ENOSYS等でカーネル内コピーできない場合は通常コピーで上書きする
+        shutil.copy2(source_path, target_path)
+        return
+    
+    shutil.copystat(source_path, target_path)
+
+
+# カテゴリ判定用のパターン（呼び出しごとのlower()・部分文字列探索を避けるため事前コンパイル）
+# 'dataset'は'data'に、'jsonl'は'json'に含まれるため短い方のみで判定する
+_DATASET_EXTENSIONS = frozenset({'.csv', '.json', '.jsonl'})
+_DATASET_KEYWORD_RE = re.compile(r'data|csv|json', re.IGNORECASE)
+_POSTER_KEYWORD_RE = re.compile(r'poster|presentation|slide', re.IGNORECASE)
+_PAPER_KEYWORD_RE = re.compile(r'paper|thesis|research|journal|conference', re.IGNORECASE)
+
+
 def _determine_file_category(filename: str, file_path: Path) -> str:
     """
     ファイル名・パス・拡張子からカテゴリを自動判定
@@ -544,31 +782,33 @@ def _determine_file_category(filename: str, file_path: Path) -> str:
     Returns:
         str: 'dataset', 'paper', 'poster'
     """
-    filename_lower = filename.lower()
-    extension = file_path.suffix.lower()
-    
+    # 判定はファイル名と拡張子のみで決まるため、その組でキャッシュする
+    return _determine_category_by_name(filename, file_path.suffix.lower())
+
+
+@lru_cache(maxsize=2048)
+def _determine_category_by_name(filename: str, extension: str) -> str:
+    """ファイル名・拡張子（小文字）からのカテゴリ判定本体"""
     # データセット判定（優先）
-    dataset_keywords = ['dataset', 'data', 'csv', 'json', 'jsonl']
-    if (extension in ['.csv', '.json', '.jsonl'] or 
-        any(keyword in filename_lower for keyword in dataset_keywords)):
+    if extension in _DATASET_EXTENSIONS or _DATASET_KEYWORD_RE.search(filename):
         return 'dataset'
     
     # ポスター判定
-    poster_keywords = ['poster', 'presentation', 'slide']
-    if any(keyword in filename_lower for keyword in poster_keywords):
+    if _POSTER_KEYWORD_RE.search(filename):
         return 'poster'
     
     # 論文判定（PDFデフォルト）
-    paper_keywords = ['paper', 'thesis', 'research', 'journal', 'conference']
-    if (extension == '.pdf' or 
-        any(keyword in filename_lower for keyword in paper_keywords)):
+    if extension == '.pdf' or _PAPER_KEYWORD_RE.search(filename):
         return 'paper'
     
     # デフォルト判定
-    if extension == '.pdf':
-        return 'paper'
-    else:
-        return 'dataset'
+    return 'dataset'
+
+
+@lru_cache(maxsize=8)
+def _data_dir_path(value: str) -> Path:
+    """DATA_DIR_PATHの値ごとにPathを1度だけ生成（環境変数の変更には追従する）"""
+    return Path(value)
 
 
 def _get_target_path(category: str, filename: str) -> Path:
@@ -582,11 +822,8 @@ def _get_target_path(category: str, filename: str) -> Path:
     Returns:
         Path: 配置先パス
     """
-    from pathlib import Path
-    import os
-    
     # DATA_DIRを取得（既存config.pyと統合）
-    data_dir = Path(os.getenv("DATA_DIR_PATH", "data"))
+    data_dir = _data_dir_path(os.getenv("DATA_DIR_PATH", "data"))
     
     if category == "dataset":
         # データセットは専用ディレクトリに配置
@@ -601,6 +838,10 @@ def _get_target_path(category: str, filename: str) -> Path:
         raise InputError(f"Unknown category: {category}")
 
 
+# データセット名から除去する末尾のバージョン・年・作業用サフィックス
+_DATASET_NAME_SUFFIX_RE = re.compile(r'[_-](v?\d+|final|temp|test|sample)$', re.IGNORECASE)
+
+
 def _extract_dataset_name(filename: str) -> str:
     """
     ファイル名からデータセット名を抽出
@@ -618,10 +859,8 @@ def _extract_dataset_name(filename: str) -> str:
     # 例: "esg_data_2024.csv" -> "esg_data"
     # 例: "research_dataset_v1.json" -> "research_dataset" 
     
-    # 数字・バージョン文字列を除去
-    import re
-    # _v1, _2024, -final などの末尾パターンを除去
-    cleaned = re.sub(r'[_-](v?\d+|final|temp|test|sample)$', '', stem, flags=re.IGNORECASE)
+    # 数字・バージョン文字列（_v1, _2024, -final など）の末尾パターンを除去
+    cleaned = _DATASET_NAME_SUFFIX_RE.sub('', stem)
     
     # 空になった場合は元の名前を使用
     if not cleaned:
@@ -648,14 +887,11 @@ def _create_new_file_object(file_path: Path, category: str):
     import hashlib
     
     try:
-        stat = file_path.stat()
-        
-        # ファイルハッシュ計算
-        sha256_hash = hashlib.sha256()
+        # 1回のopenでfstatとハッシュ計算を行う（stat後の差し替えによる不整合も防ぐ）
         with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        content_hash = sha256_hash.hexdigest()
+            stat = os.fstat(f.fileno())
+            # ファイルハッシュ計算（スキャナー・Google Drive側のcontent_hashと揃えるためSHA-256）
+            content_hash = hashlib.file_digest(f, "sha256").hexdigest()
         
         # 既存のFileクラス互換オブジェクト作成
         class FileObject:
@@ -684,6 +920,24 @@ def _create_new_file_object(file_path: Path, category: str):
         raise InputError(f"Failed to create file object: {e}")
 
 
+def _new_temp_file_counter() -> itertools.count:
+    """プロセスごとに乱数で初期化した連番（呼び出しごとの乱数読み出しを避ける）"""
+    return itertools.count(int.from_bytes(os.urandom(4), 'big'))
+
+
+_temp_file_counter = _new_temp_file_counter()
+
+
+def _reseed_temp_file_counter() -> None:
+    """fork後の子プロセスが親と同じ連番を使わないよう再初期化"""
+    global _temp_file_counter
+    _temp_file_counter = _new_temp_file_counter()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reseed_temp_file_counter)
+
+
 def create_temp_file_path(job_id: str, original_filename: str) -> Path:
     """
     一時ファイルパス生成
@@ -691,17 +945,14 @@ def create_temp_file_path(job_id: str, original_filename: str) -> Path:
     Claude Code実装ガイダンス：
     - /tmp/paas_temp/{job_id}/ 配下に配置
     - 元ファイル名を保持
-    - 重複回避のためのUUID追加
+    - 重複回避のための連番サフィックス追加
     """
-    import uuid
-    from pathlib import Path
-    
     temp_dir = Path(f"/tmp/paas_temp/{job_id}")
     temp_dir.mkdir(parents=True, exist_ok=True)
     
     # ファイル名の重複回避
     stem = Path(original_filename).stem
     suffix = Path(original_filename).suffix
-    unique_filename = f"{stem}_{uuid.uuid4().hex[:8]}{suffix}"
+    unique_filename = f"{stem}_{next(_temp_file_counter):08x}{suffix}"
     
     return temp_dir / unique_filename
\ No newline at end of file
@@ -460,9 +460,9 @@ class VectorIndexer:
             stats = await self.vector_search_port.get_index_stats()
             
             # カテゴリ別件数
-            dataset_count = len(self.dataset_repo.find_all())
-            paper_count = len(self.paper_repo.find_all())
-            poster_count = len(self.poster_repo.find_all())
+            dataset_count = self.dataset_repo.count()
+            paper_count = self.paper_repo.count()
+            poster_count = self.poster_repo.count()
             
             total_documents = dataset_count + paper_count + poster_count
             
@@ -91,7 +91,7 @@ class DataManager:
             return None
         
         # 既存チェック
-        existing = self.file_repo.find_by_path(str(path.absolute()))
+        existing = self.file_repo.find_by_path(str(path.absolute()), lite=True)
         if existing:
             logger.warning(f"ファイルは既に登録されています: {file_path}")
             return existing.id
@@ -1,7 +1,7 @@
 import json
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import Counter, defaultdict
 import logging
 
 from ..database.repository import FileRepository, AnalysisResultRepository
@@ -21,11 +21,14 @@ class StatsGenerator:
     def generate_overall_statistics(self) -> Dict[str, Any]:
         """全体の統計情報を生成"""
         all_files = self.file_repo.find_all()
+        category_stats, file_type_stats = self._get_grouped_stats(
+            all_files, "category", "file_type"
+        )
         
         stats = {
             "総ファイル数": len(all_files),
-            "カテゴリー別": self._get_category_stats(all_files),
-            "ファイルタイプ別": self._get_file_type_stats(all_files),
+            "カテゴリー別": category_stats,
+            "ファイルタイプ別": file_type_stats,
             "サイズ統計": self._get_size_stats(all_files),
             "時系列統計": self._get_timeline_stats(all_files),
             "解析状況": self._get_analysis_stats(all_files),
@@ -34,39 +37,30 @@ class StatsGenerator:
         
         return stats
     
-    def _get_category_stats(self, files: List) -> Dict[str, Any]:
-        """カテゴリー別統計"""
-        category_counts = defaultdict(int)
-        category_sizes = defaultdict(int)
+    def _get_grouped_stats(self, files: List, *attrs: str) -> List[Dict[str, Any]]:
+        """属性別（カテゴリー・ファイルタイプなど）の件数・合計サイズ統計
         
-        for file in files:
-            category_counts[file.category] += 1
-            category_sizes[file.category] += file.file_size
-        
-        return {
-            "件数": dict(category_counts),
-            "合計サイズ（MB）": {
-                cat: round(size / (1024 * 1024), 2) 
-                for cat, size in category_sizes.items()
-            }
-        }
-    
-    def _get_file_type_stats(self, files: List) -> Dict[str, Any]:
-        """ファイルタイプ別統計"""
-        type_counts = defaultdict(int)
-        type_sizes = defaultdict(int)
+        指定した属性ごとの統計を、ファイル一覧を1回走査して指定順に返す。
+        """
+        counts = [Counter() for _ in attrs]
+        sizes = [Counter() for _ in attrs]
         
         for file in files:
-            type_counts[file.file_type] += 1
-            type_sizes[file.file_type] += file.file_size
+            for attr, attr_counts, attr_sizes in zip(attrs, counts, sizes):
+                value = getattr(file, attr)
+                attr_counts[value] += 1
+                attr_sizes[value] += file.file_size
         
-        return {
-            "件数": dict(type_counts),
-            "合計サイズ（MB）": {
-                ft: round(size / (1024 * 1024), 2) 
-                for ft, size in type_sizes.items()
+        return [
+            {
+                "件数": dict(attr_counts),
+                "合計サイズ（MB）": {
+                    value: round(size / (1024 * 1024), 2)
+                    for value, size in attr_sizes.items()
+                }
             }
-        }
+            for attr_counts, attr_sizes in zip(counts, sizes)
+        ]
     
     def _get_size_stats(self, files: List) -> Dict[str, Any]:
         """サイズ統計"""
@@ -181,7 +175,7 @@ class StatsGenerator:
             "カテゴリー": category,
             "ファイル数": len(files),
             "合計サイズ（MB）": round(sum(f.file_size for f in files) / (1024 * 1024), 2),
-            "ファイルタイプ分布": self._get_file_type_stats(files),
+            "ファイルタイプ分布": self._get_grouped_stats(files, "file_type")[0],
             "主要キーワード": dict(top_keywords),
             "研究分野": dict(research_fields),
             "最新ファイル": [
@@ -0,0 +1,95 @@
+"""input_portsの既存NewFileIndexer連携ヘルパーのテスト"""
+
+import sys
+import types
+
+import pytest
+
+from agent.source.interfaces import input_ports
+
+
+class _FakeIndexer:
+    """failing_namesに含まれる論文・ポスターの登録に失敗するNewFileIndexerの代替"""
+    
+    instances = 0
+    failing_names = set()
+    
+    def __init__(self, auto_analyze: bool = True):
+        type(self).instances += 1
+        self.processed = []
+    
+    def _process_paper(self, file_obj):
+        self.processed.append(file_obj.file_name)
+        return file_obj.file_name not in self.failing_names
+    
+    def _process_poster(self, file_obj):
+        self.processed.append(file_obj.file_name)
+        return file_obj.file_name not in self.failing_names
+    
+    def index_all_files(self):
+        return {}
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """一時データディレクトリとNewFileIndexerの差し替え"""
+    data_dir = tmp_path / 'data'
+    monkeypatch.setenv('DATA_DIR_PATH', str(data_dir))
+    
+    fake_module = types.ModuleType('agent.source.indexer.new_indexer')
+    fake_module.NewFileIndexer = _FakeIndexer
+    monkeypatch.setitem(sys.modules, 'agent.source.indexer.new_indexer', fake_module)
+    _FakeIndexer.instances = 0
+    _FakeIndexer.failing_names = {'broken_paper.pdf'}
+    return data_dir
+
+
+def _write(path, content=b'content'):
+    path.write_bytes(content)
+    return str(path)
+
+
+class TestIntegrateBatchWithExistingIndexer:
+    """integrate_batch_with_existing_indexerのテスト"""
+    
+    async def test_failure_in_middle_of_batch(self, tmp_path, data_dir):
+        """途中のファイルが失敗しても他は統合され、失敗分のコピーは残らない"""
+        files = [
+            (_write(tmp_path / 'a.pdf'), 'paper', 'first_paper.pdf'),
+            (_write(tmp_path / 'b.pdf'), 'paper', 'broken_paper.pdf'),
+            (str(tmp_path / 'missing.pdf'), 'paper', 'missing_paper.pdf'),
+            (_write(tmp_path / 'c.pdf'), 'poster', 'last_poster.pdf'),
+        ]
+        
+        results = await input_ports.integrate_batch_with_existing_indexer(files)
+        
+        assert results == [
+            data_dir / 'paper' / 'first_paper.pdf',
+            None,
+            None,
+            data_dir / 'poster' / 'last_poster.pdf',
+        ]
+        assert sorted(p.name for p in (data_dir / 'paper').iterdir()) == ['first_paper.pdf']
+        assert (data_dir / 'poster' / 'last_poster.pdf').read_bytes() == b'content'
+        assert _FakeIndexer.instances == 1
+    
+    async def test_retry_after_failure_does_not_duplicate(self, tmp_path, data_dir):
+        """失敗したファイルを再実行しても name_1 のような重複コピーを作らない"""
+        source = _write(tmp_path / 'b.pdf')
+        
+        first = await input_ports.integrate_batch_with_existing_indexer(
+            [(source, 'paper', 'broken_paper.pdf')]
+        )
+        assert first == [None]
+        
+        _FakeIndexer.failing_names = set()
+        retried = await input_ports.integrate_batch_with_existing_indexer(
+            [(source, 'paper', 'broken_paper.pdf')]
+        )
+        assert retried == [data_dir / 'paper' / 'broken_paper.pdf']
+        assert sorted(p.name for p in (data_dir / 'paper').iterdir()) == ['broken_paper.pdf']
+    
+    async def test_empty_batch(self, data_dir):
+        """空のバッチではNewFileIndexerを生成しない"""
+        assert await input_ports.integrate_batch_with_existing_indexer([]) == []
+        assert _FakeIndexer.instances == 0
@@ -0,0 +1,66 @@
+"""models.pyのmetadataシリアライズのテスト"""
+
+from datetime import datetime
+
+import pytest
+
+from agent.source.database import models
+
+
+METADATA = {
+    "タイトル": "機械学習による自然言語処理",
+    "tags": ["データ", "ESG"],
+    "pages": 12,
+    "nested": {"著者": "山田"},
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    """orjsonあり・なしの両方の経路で実行"""
+    if request.param == "orjson":
+        if not models.ORJSON_AVAILABLE:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(models, "ORJSON_AVAILABLE", False)
+    return request.param
+
+
+class TestMetadataSerialization:
+    """dump_metadata / load_metadataのテスト"""
+    
+    def test_round_trip_non_ascii(self, backend):
+        """非ASCII文字を含むmetadataが往復で一致し、エスケープされずに保存される"""
+        dumped = models.dump_metadata(METADATA)
+        
+        assert "機械学習による自然言語処理" in dumped
+        assert "\\u" not in dumped
+        assert models.load_metadata(dumped) == METADATA
+    
+    def test_backends_produce_same_text(self, monkeypatch):
+        """orjsonの有無で保存される文字列が変わらない"""
+        if not models.ORJSON_AVAILABLE:
+            pytest.skip("orjson is not installed")
+        metadata = dict(METADATA, indexed=datetime(2024, 1, 2, 3, 4, 5), count=3)
+        
+        with_orjson = models.dump_metadata(metadata)
+        monkeypatch.setattr(models, "ORJSON_AVAILABLE", False)
+        without_orjson = models.dump_metadata(metadata)
+        
+        assert with_orjson == without_orjson
+    
+    def test_datetime_value(self, backend):
+        """datetimeはどちらの経路でもISO 8601文字列として保存される"""
+        dumped = models.dump_metadata({"indexed": datetime(2024, 1, 2, 3, 4, 5)})
+        
+        assert models.load_metadata(dumped) == {"indexed": "2024-01-02T03:04:05"}
+    
+    def test_unsupported_type_raises(self, backend):
+        """JSONに変換できない型はどちらの経路でもTypeError"""
+        with pytest.raises(TypeError):
+            models.dump_metadata({"value": object()})
+    
+    def test_empty_metadata(self, backend):
+        """空のmetadataはNULLとして保存される"""
+        assert models.dump_metadata({}) is None
+        assert models.dump_metadata(None) is None
@@ -134,9 +134,9 @@ async def index(request: Request):
     
     # 統計情報取得
     stats = {
-        "papers": len(paper_repo.find_all()),
-        "posters": len(poster_repo.find_all()),
-        "datasets": len(dataset_repo.find_all())
+        "papers": paper_repo.count(),
+        "posters": poster_repo.count(),
+        "datasets": dataset_repo.count()
     }
     
     return templates.TemplateResponse("index.html", {
@@ -153,9 +153,9 @@ async def get_system_status():
         "auth": auth_manager.is_enabled(),
         "database": True,
         "stats": {
-            "papers": len(paper_repo.find_all()),
-            "posters": len(poster_repo.find_all()),
-            "datasets": len(dataset_repo.find_all())
+            "papers": paper_repo.count(),
+            "posters": poster_repo.count(),
+            "datasets": dataset_repo.count()
         }
     })
 
@@ -218,9 +218,9 @@ async def perform_google_drive_sync(folder_type: str):
         
         # 統計情報を更新（キャッシュクリア効果）
         stats = {
-            "papers": len(paper_repo.find_all()),
-            "posters": len(poster_repo.find_all()),
-            "datasets": len(dataset_repo.find_all())
+            "papers": paper_repo.count(),
+            "posters": poster_repo.count(),
+            "datasets": dataset_repo.count()
         }
         logger.info(f"同期後統計: 論文{stats['papers']}件, ポスター{stats['posters']}件, データセット{stats['datasets']}件")
         